@@ -43,6 +43,18 @@ class Settings(BaseSettings):
     TG_USERNAME_CONCEPTUALIZATOR: str = ""
     TG_USERNAME_SIMULATOR: str = ""
 
+    # --- Telegram Bot API client ---
+    # Connections per Bot object (PTB defaults to 1, which serializes all
+    # concurrent sends from one process). TG_HTTP2 needs the h2 package.
+    TG_POOL_SIZE: int = 50
+    # Seconds to wait for a free pooled connection before TimedOut (PTB: 1.0).
+    TG_POOL_TIMEOUT: float = 10.0
+    TG_HTTP2: bool = False
+    # Worker processes dispatching the outbox. Each paces every bot at an
+    # equal share of the per-bot send rate, so together they stay under
+    # Telegram's ~30 msg/sec limit. Keep in step with the worker replica count.
+    WORKER_REPLICAS: int = 1
+
     # --- Admin ---
     ADMIN_IDS: str = ""  # comma-separated telegram IDs, e.g. "123456,789012"
     ADMIN_CHAT_ID: Optional[int] = None  # single chat/user ID for admin alerts
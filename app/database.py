@@ -2,15 +2,31 @@
 PsycheOS Backend — Database setup (async SQLAlchemy)
 Uses Supabase pooler (port 6543, PgBouncer transaction mode) for production connections.
 """
+import asyncio
+import logging
+
+import orjson
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
+
+def _json_dumps(value) -> bytes:
+    """JSONB bind serializer — orjson emits UTF-8 bytes that psycopg sends as-is."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
 
 engine = create_async_engine(
     settings.database_url_async,
     # ── Connection pool ───────────────────────────────────────────────────────
+    # AsyncAdaptedQueuePool is the asyncio-safe queue pool (the sync QueuePool
+    # must not be used with an async engine). Never swap in NullPool here:
+    # every request would pay a full TCP + TLS + PgBouncer handshake.
     # Sized for 30 concurrent users across the web process.
+    poolclass=AsyncAdaptedQueuePool,
     # Supabase PgBouncer (port 6543, transaction mode) multiplexes these into
     # a smaller number of real Postgres connections on its side.
     pool_size=10,        # base pool — 10 idle connections kept alive
@@ -23,6 +39,12 @@ engine = create_async_engine(
     # statements: each transaction may land on a different backend connection.
     # prepare_threshold=None disables psycopg3's automatic statement preparation.
     connect_args={"prepare_threshold": None},
+    # ── JSONB (de)serialization ───────────────────────────────────────────────
+    # Session payloads (state_payload, screening vectors, response_history)
+    # round-trip on every update; orjson is several times faster than stdlib
+    # json on these Cyrillic-heavy documents.
+    json_serializer=_json_dumps,
+    json_deserializer=orjson.loads,
     echo=settings.DEBUG,
 )
 
@@ -33,6 +55,29 @@ class Base(DeclarativeBase):
     pass
 
 
+async def warm_pool() -> None:
+    """Open pool_size connections up front so the first requests skip connect.
+
+    Connections are checked out concurrently (so the pool really creates
+    that many) and returned immediately. Failures are logged, not raised —
+    the pool will connect lazily as before.
+    """
+    size = engine.pool.size()
+    results = await asyncio.gather(
+        *(engine.connect().start() for _ in range(size)), return_exceptions=True
+    )
+    conns = [r for r in results if not isinstance(r, BaseException)]
+    await asyncio.gather(*(conn.close() for conn in conns))
+    if len(conns) < size:
+        error = next(r for r in results if isinstance(r, BaseException))
+        logger.warning(
+            "DB pool warm-up: %d/%d connections opened (%s); rest connect lazily",
+            len(conns), size, error,
+        )
+    else:
+        logger.info("DB pool warmed: %d connections", size)
+
+
 async def get_db() -> AsyncSession:
     """Dependency: yields a DB session, auto-closes after use."""
     async with async_session() as session:
@@ -9,9 +9,10 @@ from contextlib import asynccontextmanager
 
 import sentry_sdk
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
 from app.config import settings
-from app.database import engine, Base
+from app.database import engine, warm_pool, Base
 import app.models  # noqa: F401 — registers all ORM models in Base.metadata (needed for create_all)
 from app.webhooks.router_factory import create_webhook_router
 from app.webhooks.pro import handle_pro
@@ -21,6 +22,7 @@ from app.webhooks.simulator import handle_simulator
 from app.webhooks.screen import handle_screen
 from app.routers.links import router as links_router
 from app.routers.artifacts import router as artifacts_router
+from app.services.anthropic_client import close_anthropic_client
 
 # --- Logging ---
 logging.basicConfig(
@@ -71,13 +73,15 @@ def _run_pending_migrations() -> None:
         logger.error(f"_run_pending_migrations failed: {e}")
 
 
-# --- Lifespan: run migrations, then keep engine alive ---
+# --- Lifespan: run migrations, warm the DB pool, then keep engine alive ---
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting PsycheOS Backend...")
     _run_pending_migrations()
+    await warm_pool()
     yield
     logger.info("Shutting down PsycheOS Backend...")
+    await close_anthropic_client()
     await engine.dispose()
 
 # --- App ---
@@ -85,6 +89,7 @@ app = FastAPI(
     title="PsycheOS Backend",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
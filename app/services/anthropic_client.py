@@ -0,0 +1,29 @@
+"""
+Shared AsyncAnthropic client.
+
+One client per process: its httpx pool keeps connections (and TLS sessions)
+to the Anthropic API alive across calls instead of paying a fresh handshake
+for every Claude request. Created lazily so importing a handler module does
+not require ANTHROPIC_API_KEY.
+"""
+from anthropic import AsyncAnthropic
+
+from app.config import settings
+
+_client: AsyncAnthropic | None = None
+
+
+def get_anthropic_client() -> AsyncAnthropic:
+    """Return the process-wide AsyncAnthropic client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+    return _client
+
+
+async def close_anthropic_client() -> None:
+    """Close the shared client's connection pool (call on shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
@@ -22,6 +22,7 @@ Ledger (audit trail, non-additive):
 from __future__ import annotations
 
 import logging
+import time
 import uuid
 from typing import Optional
 
@@ -60,11 +61,18 @@ async def get_or_create_wallet(
     db: AsyncSession,
     user_id: uuid.UUID,
     telegram_id: int,
+    *,
+    for_update: bool = False,
 ) -> Wallet:
-    """Return the wallet for the user, creating one with zero balance if absent."""
-    result = await db.execute(
-        select(Wallet).where(Wallet.user_id == user_id)
-    )
+    """Return the wallet for the user, creating one with zero balance if absent.
+
+    for_update=True loads the row with SELECT FOR UPDATE so the caller can
+    hand it to reserve_stars(wallet_locked=True) without a second fetch.
+    """
+    stmt = select(Wallet).where(Wallet.user_id == user_id)
+    if for_update:
+        stmt = stmt.with_for_update()
+    result = await db.execute(stmt)
     wallet = result.scalar_one_or_none()
     if wallet is None:
         wallet = Wallet(user_id=user_id)
@@ -94,14 +102,29 @@ async def get_rate(
     return result.scalar_one_or_none()
 
 
+# Rates change only through migrations / manual SQL, yet every tool launch
+# asked for one. A short TTL keeps repeat launches off the DB while letting
+# price edits take effect within a minute. Keys are the few (service,
+# operation) pairs, so the dict stays tiny.
+_PRICE_TTL = 60.0
+_price_cache: dict[tuple[str, str], tuple[float, Optional[int]]] = {}
+
+
 async def get_stars_price(
     db: AsyncSession,
     service_id: str,
     operation: str = "session",
 ) -> Optional[int]:
-    """Convenience: return the Stars price int or None."""
+    """Convenience: return the Stars price int or None (cached for _PRICE_TTL)."""
+    key = (service_id, operation)
+    now = time.monotonic()
+    cached = _price_cache.get(key)
+    if cached is not None and now - cached[0] < _PRICE_TTL:
+        return cached[1]
     rate = await get_rate(db, service_id, operation)
-    return rate.stars_price if rate else None
+    price = rate.stars_price if rate else None
+    _price_cache[key] = (now, price)
+    return price
 
 
 # ---------------------------------------------------------------------------
@@ -117,6 +140,8 @@ async def reserve_stars(
     run_id: uuid.UUID,
     service_id: str,
     operation: str = "session",
+    *,
+    wallet_locked: bool = False,
 ) -> None:
     """
     Lock *stars* for an in-flight job.
@@ -126,15 +151,18 @@ async def reserve_stars(
 
     Re-fetches the wallet row with SELECT FOR UPDATE so that concurrent
     reserve_stars calls serialize at the DB level and cannot both pass
-    the available-balance check on stale data.
+    the available-balance check on stale data. Pass wallet_locked=True when
+    the caller already holds that lock (get_or_create_wallet(for_update=True)
+    in the same transaction) to skip the re-fetch.
     """
-    # Re-fetch under row-level lock before the critical section.
-    # The wallet object passed by the caller may be stale if two requests
-    # raced through the pre-check in the webhook layer simultaneously.
-    locked = await db.execute(
-        select(Wallet).where(Wallet.wallet_id == wallet.wallet_id).with_for_update()
-    )
-    wallet = locked.scalar_one()
+    if not wallet_locked:
+        # Re-fetch under row-level lock before the critical section.
+        # The wallet object passed by the caller may be stale if two requests
+        # raced through the pre-check in the webhook layer simultaneously.
+        locked = await db.execute(
+            select(Wallet).where(Wallet.wallet_id == wallet.wallet_id).with_for_update()
+        )
+        wallet = locked.scalar_one()
 
     available = wallet.balance_stars - wallet.reserved_stars
     if available < stars:
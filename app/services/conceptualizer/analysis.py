@@ -1,10 +1,12 @@
 """Async hypothesis extraction using Claude API."""
-import json
 import logging
+import re
+import time
 
-from anthropic import AsyncAnthropic
+import anthropic
 
-from app.config import settings
+from app.services.anthropic_client import get_anthropic_client
+from app.utils.json_fence import loads_json_response
 
 from .enums import ConfidenceLevel, HypothesisType, PsycheLevelEnum
 from .models import Hypothesis, SessionState
@@ -13,6 +15,27 @@ logger = logging.getLogger(__name__)
 
 _ANTHROPIC_MODEL = "claude-sonnet-4-5-20250929"
 
+# Circuit breaker for Claude outages: after _BREAKER_THRESHOLD consecutive API
+# errors, skip the call for _BREAKER_COOLDOWN seconds and go straight to the
+# fallback hypothesis instead of waiting out a timeout on every message.
+# Only outage-type errors count; client-side 4xx errors (bad request, auth)
+# fall back without tripping it. The count restarts once the cooldown ends.
+_OUTAGE_ERRORS = (
+    anthropic.APIConnectionError,
+    anthropic.APITimeoutError,
+    anthropic.RateLimitError,
+    anthropic.InternalServerError,
+)
+_BREAKER_THRESHOLD = 5
+_BREAKER_COOLDOWN = 30.0
+_consecutive_failures = 0
+_cooldown_until = 0.0
+
+# value → member maps: a plain dict lookup instead of Enum.__call__ per field.
+_HYP_TYPE_BY_VALUE = {m.value: m for m in HypothesisType}
+_LEVEL_BY_VALUE = {m.value: m for m in PsycheLevelEnum}
+_CONFIDENCE_BY_VALUE = {m.value: m for m in ConfidenceLevel}
+
 _EXTRACT_HYPOTHESIS_PROMPT = """\
 Ты - эксперт по анализу психотерапевтических концептуализаций в рамках PsycheOS framework.
 
@@ -103,40 +126,47 @@ _EXTRACT_HYPOTHESIS_PROMPT = """\
 """
 
 
+# Phrases that mark a formulation as managerial. Compiled into one
+# alternation so a formulation is scanned once instead of once per marker;
+# the zero-width lookahead also catches overlapping markers
+# ("критическая точка управления" counts both phrases).
+_MANAGERIAL_MARKERS = (
+    "можно", "нужно", "стоит", "начать с", "вмешаться",
+    "воздействовать", "влиять", "изменить", "скорректировать",
+    "работать с", "фокус на", "приоритет", "критическая точка",
+    "точка управления", "leverage",
+)
+_MANAGERIAL_MARKERS_RE = re.compile(
+    "(?=(" + "|".join(map(re.escape, _MANAGERIAL_MARKERS)) + "))"
+)
+
+
 def _post_process_type(formulation: str, extracted_type: str) -> str:
     """Override to managerial if 2+ managerial markers found in formulation."""
-    markers = [
-        "можно", "нужно", "стоит", "начать с", "вмешаться",
-        "воздействовать", "влиять", "изменить", "скорректировать",
-        "работать с", "фокус на", "приоритет", "критическая точка",
-        "точка управления", "leverage",
-    ]
-    fl = formulation.lower()
-    count = sum(1 for m in markers if m in fl)
+    count = len(set(_MANAGERIAL_MARKERS_RE.findall(formulation.lower())))
     if count >= 2 and extracted_type != "managerial":
         logger.warning(
-            f"[conceptualizator] Type override: '{extracted_type}' → 'managerial' "
-            f"({count} managerial markers)"
+            "[conceptualizator] Type override: '%s' → 'managerial' (%d managerial markers)",
+            extracted_type, count,
         )
         return "managerial"
     return extracted_type
 
 
+def _next_hypothesis_id(session: SessionState) -> str:
+    return f"hyp_{session.progress.hypotheses_added + 1:03d}"
+
+
 def _parse_json(text: str) -> dict:
-    t = text.strip()
-    if t.startswith("```json"):
-        t = t[7:]
-    if t.startswith("```"):
-        t = t[3:]
-    if t.endswith("```"):
-        t = t[:-3]
-    return json.loads(t.strip())
+    return loads_json_response(text)
 
 
 async def extract_hypothesis_from_response(
     message: str, session: SessionState
 ) -> Hypothesis:
     """Extract a structured hypothesis from the specialist's message using Claude."""
+    global _consecutive_failures, _cooldown_until
+
     prior_ctx_parts = []
     if session.screen_context:
         prior_ctx_parts.append(f"### Данные скрининга:\n{session.screen_context[:500]}")
@@ -147,10 +177,11 @@ async def extract_hypothesis_from_response(
         if prior_ctx_parts else ""
     )
 
+    active_count, managerial_count = session.get_hypothesis_counts()
     user_message = (
         f"Контекст сессии:\n"
-        f"- Текущих гипотез: {len(session.get_active_hypotheses())}\n"
-        f"- Управленческих гипотез: {len(session.get_managerial_hypotheses())}\n"
+        f"- Текущих гипотез: {active_count}\n"
+        f"- Управленческих гипотез: {managerial_count}\n"
         f"- Вопросов задано: {session.progress.dialogue_turns}\n"
         f"{prior_ctx}"
         f"Ответ специалиста:\n{message}\n\n"
@@ -158,36 +189,64 @@ async def extract_hypothesis_from_response(
         'ВАЖНО: Если текст содержит слова "можно", "нужно", "стоит", '
         '"вмешаться" - это MANAGERIAL!'
     )
+    if _cooldown_until:
+        if time.monotonic() < _cooldown_until:
+            logger.warning("[conceptualizator] Claude circuit open; using fallback hypothesis")
+            return _fallback_hypothesis(message, session)
+        # Cooldown over: give Claude a full threshold of attempts again.
+        _consecutive_failures = 0
+        _cooldown_until = 0.0
+
     try:
-        client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+        client = get_anthropic_client()
         resp = await client.messages.create(
             model=_ANTHROPIC_MODEL,
             max_tokens=1000,
             system=_EXTRACT_HYPOTHESIS_PROMPT,
             messages=[{"role": "user", "content": user_message}],
         )
+    except _OUTAGE_ERRORS:
+        _consecutive_failures += 1
+        if _consecutive_failures >= _BREAKER_THRESHOLD:
+            _cooldown_until = time.monotonic() + _BREAKER_COOLDOWN
+            logger.error(
+                "[conceptualizator] %d consecutive Claude errors; pausing calls for %.0fs",
+                _consecutive_failures, _BREAKER_COOLDOWN,
+            )
+        logger.exception("[conceptualizator] Claude call failed; using fallback")
+        return _fallback_hypothesis(message, session)
+    except Exception:
+        logger.exception("[conceptualizator] Error extracting hypothesis; using fallback")
+        return _fallback_hypothesis(message, session)
+    _consecutive_failures = 0
+
+    try:
         data = _parse_json(resp.content[0].text)
-        logger.debug(f"[conceptualizator] Claude hypothesis data: {data}")
+        logger.debug("[conceptualizator] Claude hypothesis data: %s", data)
 
         corrected_type = _post_process_type(data["formulation"], data["type"])
         data["type"] = corrected_type
 
-        hyp_id = f"hyp_{session.progress.hypotheses_added + 1:03d}"
         return Hypothesis(
-            id=hyp_id,
-            type=HypothesisType(data["type"]),
-            levels=[PsycheLevelEnum(lv) for lv in data["levels"]],
+            id=_next_hypothesis_id(session),
+            type=_HYP_TYPE_BY_VALUE[data["type"]],
+            levels=[_LEVEL_BY_VALUE[lv] for lv in data["levels"]],
             formulation=data["formulation"],
-            confidence=ConfidenceLevel(data["confidence"]),
+            confidence=_CONFIDENCE_BY_VALUE[data["confidence"]],
             foundations=[data.get("reasoning", "")],
         )
     except Exception:
         logger.exception("[conceptualizator] Error extracting hypothesis; using fallback")
-        return Hypothesis(
-            id=f"hyp_{session.progress.hypotheses_added + 1:03d}",
-            type=HypothesisType.STRUCTURAL,
-            levels=[PsycheLevelEnum.L0],
-            formulation=message[:300],
-            confidence=ConfidenceLevel.WEAK,
-            foundations=["Fallback extraction"],
-        )
+        return _fallback_hypothesis(message, session)
+
+
+def _fallback_hypothesis(message: str, session: SessionState) -> Hypothesis:
+    """Weak structural hypothesis built from the raw message when Claude fails."""
+    return Hypothesis(
+        id=_next_hypothesis_id(session),
+        type=HypothesisType.STRUCTURAL,
+        levels=[PsycheLevelEnum.L0],
+        formulation=message[:300],
+        confidence=ConfidenceLevel.WEAK,
+        foundations=["Fallback extraction"],
+    )
@@ -7,6 +7,10 @@ from .enums import ConfidenceLevel, HypothesisType, PsycheLevelEnum, QuestionTyp
 from .models import Hypothesis, SessionState
 
 
+# Confidence levels that count as an established (non-weak) hypothesis.
+_CONFIDENT_LEVELS = frozenset({ConfidenceLevel.WORKING, ConfidenceLevel.DOMINANT})
+
+
 # ── Priority ──────────────────────────────────────────────────────────────────
 
 class Priority(IntEnum):
@@ -36,9 +40,10 @@ class PriorityChecker:
         return Priority.NONE, "No specific priority — general exploration"
 
     def _check_no_managerial(self) -> Tuple[Priority, str]:
-        s = sum(1 for h in self.active if h.type == HypothesisType.STRUCTURAL)
-        f = sum(1 for h in self.active if h.type == HypothesisType.FUNCTIONAL)
-        d = sum(1 for h in self.active if h.type == HypothesisType.DYNAMIC)
+        counts = self.session.get_type_counts()
+        s = counts.get(HypothesisType.STRUCTURAL, 0)
+        f = counts.get(HypothesisType.FUNCTIONAL, 0)
+        d = counts.get(HypothesisType.DYNAMIC, 0)
         m = len(self.managerial)
 
         if (s > 0 or f > 0 or d > 0) and m == 0:
@@ -73,7 +78,7 @@ class PriorityChecker:
                 )
             confident = [
                 h for h in self.active
-                if h.confidence in [ConfidenceLevel.WORKING, ConfidenceLevel.DOMINANT]
+                if h.confidence in _CONFIDENT_LEVELS
             ]
             if not confident:
                 return Priority.MEDIUM, (
@@ -148,20 +153,23 @@ class QuestionGenerator:
         return "Какое альтернативное объяснение могло бы учесть те же данные?"
 
     def generate_control_check(self) -> str:
-        if not self.session.get_managerial_hypotheses():
+        if not self.session.has_managerial_hypothesis():
             return "Где эта система может быть реально затронута? Что может измениться?"
         return "Кто реальный агент изменения? Какова последовательность?"
 
     def generate_question(self, question_type: QuestionType) -> str:
-        generators = {
-            QuestionType.LEVEL_CHECK: self.generate_level_check,
-            QuestionType.FUNCTION_CHECK: self.generate_function_check,
-            QuestionType.DYNAMICS_CHECK: self.generate_dynamics_check,
-            QuestionType.ALTERNATIVES_CHECK: self.generate_alternatives_check,
-            QuestionType.CONTROL_CHECK: self.generate_control_check,
-        }
-        gen = generators.get(question_type)
-        return gen() if gen else "Можете ли вы подробнее рассказать?"
+        gen = _GENERATORS.get(question_type)
+        return gen(self) if gen else "Можете ли вы подробнее рассказать?"
+
+
+# question type → QuestionGenerator method (unbound; called with the instance)
+_GENERATORS = {
+    QuestionType.LEVEL_CHECK: QuestionGenerator.generate_level_check,
+    QuestionType.FUNCTION_CHECK: QuestionGenerator.generate_function_check,
+    QuestionType.DYNAMICS_CHECK: QuestionGenerator.generate_dynamics_check,
+    QuestionType.ALTERNATIVES_CHECK: QuestionGenerator.generate_alternatives_check,
+    QuestionType.CONTROL_CHECK: QuestionGenerator.generate_control_check,
+}
 
 
 # ── Selector ──────────────────────────────────────────────────────────────────
@@ -1,6 +1,7 @@
 """Core Pydantic models for PsycheOS Conceptualizer (production version)."""
+from collections import Counter
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from pydantic import BaseModel, Field
 
@@ -16,6 +17,18 @@ from .enums import (
 )
 
 
+# state → states it may move to
+_VALID_TRANSITIONS = {
+    SessionStateEnum.INIT: frozenset({SessionStateEnum.DATA_COLLECTION}),
+    SessionStateEnum.DATA_COLLECTION: frozenset({SessionStateEnum.ANALYSIS}),
+    SessionStateEnum.ANALYSIS: frozenset({SessionStateEnum.SOCRATIC_DIALOGUE}),
+    SessionStateEnum.SOCRATIC_DIALOGUE: frozenset({SessionStateEnum.OUTPUT_ASSEMBLY}),
+    SessionStateEnum.OUTPUT_ASSEMBLY: frozenset({SessionStateEnum.COMPLETE}),
+}
+
+_BLOCKING_SEVERITIES = frozenset({RedFlagSeverity.STOP, RedFlagSeverity.CRITICAL})
+
+
 class Hypothesis(BaseModel):
     id: str
     type: HypothesisType
@@ -80,37 +93,36 @@ class SessionState(BaseModel):
     def get_managerial_hypotheses(self) -> List[Hypothesis]:
         return [h for h in self.hypotheses if h.type == HypothesisType.MANAGERIAL]
 
+    def has_managerial_hypothesis(self) -> bool:
+        """True at the first managerial hypothesis, without building a list."""
+        return any(h.type == HypothesisType.MANAGERIAL for h in self.hypotheses)
+
+    def get_type_counts(self) -> Dict[HypothesisType, int]:
+        """Hypothesis count per type in one pass, in first-seen order."""
+        return Counter(h.type for h in self.hypotheses)
+
+    def get_hypothesis_counts(self) -> Tuple[int, int]:
+        """(active, managerial) counts in one pass, without building lists."""
+        managerial = sum(1 for h in self.hypotheses if h.type == HypothesisType.MANAGERIAL)
+        return len(self.hypotheses), managerial
+
     def has_blocking_flags(self) -> bool:
-        return any(
-            f.severity in [RedFlagSeverity.STOP, RedFlagSeverity.CRITICAL]
-            for f in self.red_flags
-        )
+        return any(f.severity in _BLOCKING_SEVERITIES for f in self.red_flags)
 
     def get_blocking_red_flags(self) -> List[RedFlag]:
-        return [
-            f for f in self.red_flags
-            if f.severity in [RedFlagSeverity.STOP, RedFlagSeverity.CRITICAL]
-        ]
+        return [f for f in self.red_flags if f.severity in _BLOCKING_SEVERITIES]
 
     def can_proceed_to_output(self) -> bool:
         if len(self.hypotheses) < 2:
             return False
-        if not self.get_managerial_hypotheses():
+        if not self.has_managerial_hypothesis():
             return False
         if self.has_blocking_flags():
             return False
         return True
 
     def transition_to(self, new_state: SessionStateEnum) -> None:
-        valid_transitions = {
-            SessionStateEnum.INIT: [SessionStateEnum.DATA_COLLECTION],
-            SessionStateEnum.DATA_COLLECTION: [SessionStateEnum.ANALYSIS],
-            SessionStateEnum.ANALYSIS: [SessionStateEnum.SOCRATIC_DIALOGUE],
-            SessionStateEnum.SOCRATIC_DIALOGUE: [SessionStateEnum.OUTPUT_ASSEMBLY],
-            SessionStateEnum.OUTPUT_ASSEMBLY: [SessionStateEnum.COMPLETE],
-        }
-        allowed = valid_transitions.get(self.state, [])
-        if new_state not in allowed:
+        if new_state not in _VALID_TRANSITIONS.get(self.state, frozenset()):
             raise ValueError(f"Cannot transition from {self.state} to {new_state}")
         self.state = new_state
         self.updated_at = datetime.now(timezone.utc)
@@ -1,12 +1,10 @@
 """Async output assembly (Layers A, B, C) using Claude API."""
-import json
 import logging
 
-from anthropic import AsyncAnthropic
+from app.services.anthropic_client import get_anthropic_client
+from app.utils.json_fence import loads_json_response
 
-from app.config import settings
-
-from .enums import PsycheLevelEnum
+from .enums import HypothesisType, PsycheLevelEnum
 from .models import (
     ConceptualizationOutput,
     InterventionTarget,
@@ -206,52 +204,75 @@ _LAYER_C_PROMPT = """\
 """
 
 
+# User-message templates: static instructions are built once at import, only
+# the session-specific blocks are substituted per call via format_map.
+
+_LAYER_A_USER_TEMPLATE = (
+    "{hypotheses}{prior_context}\n"
+    "На основе этих гипотез создай Layer A - техническую модель для специалиста.\n\n"
+    "КРИТИЧЕСКИ ВАЖНО:\n"
+    "1. Dominant layer - определи по УПРАВЛЯЮЩЕМУ КОНФЛИКТУ, не по частоте упоминаний\n"
+    "2. Configuration - покажи петли со СТРЕЛКАМИ (A→B→C), не абзацем\n"
+    "3. System cost - конкретная цена для L0, L3, L4"
+)
+
+_LAYER_B_USER_TEMPLATE = (
+    "{hypotheses}{prior_context}\n"
+    "На основе этих управленческих гипотез создай Layer B - мишени вмешательства.\n\n"
+    "КРИТИЧЕСКИ ВАЖНО:\n"
+    "- Direction = ЧТО должно измениться, НЕ описание паттерна!\n"
+    "- Формулировки конкретные и actionable\n"
+    "- Приоритеты: L0 = 1-2, L4 = 4-5"
+)
+
+_LAYER_C_USER_TEMPLATE = (
+    "{hypotheses}\n\n"
+    "На основе этого понимания создай Layer C - метафорический нарратив для клиента.\n\n"
+    "КРИТИЧЕСКИ ВАЖНО:\n"
+    "- Метафора должна схватывать УПРАВЛЯЮЩИЙ КОНФЛИКТ, не симптом\n"
+    "- Нарратив на языке ОПЫТА, без L0-L4, гипотез, диагнозов\n"
+    "- Клиент должен узнать себя"
+)
+
+
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
+_TYPE_HEADERS = {t: t.value.upper() for t in HypothesisType}
+
+
 def _parse_json(text: str) -> dict:
-    t = text.strip()
-    if t.startswith("```json"):
-        t = t[7:]
-    if t.startswith("```"):
-        t = t[3:]
-    if t.endswith("```"):
-        t = t[:-3]
-    return json.loads(t.strip())
+    return loads_json_response(text)
 
 
 def _hypotheses_context(session: SessionState) -> str:
     lines = ["# Гипотезы:\n"]
     for hyp in session.get_active_hypotheses():
         levels_str = ", ".join(l.value for l in hyp.levels)
-        lines.append(f"**{hyp.type.value.upper()}** [{levels_str}]")
+        lines.append(f"**{_TYPE_HEADERS[hyp.type]}** [{levels_str}]")
         lines.append(hyp.formulation)
         lines.append(f"Уверенность: {hyp.confidence.value}\n")
     return "\n".join(lines)
 
 
+def _prior_context(session: SessionState, heading: str, limit: int) -> str:
+    parts = []
+    if session.screen_context:
+        parts.append(f"### Скрининг:\n{session.screen_context[:limit]}")
+    if session.interpreter_context:
+        parts.append(f"### Интерпретация:\n{session.interpreter_context[:limit]}")
+    if not parts:
+        return ""
+    return f"\n\n## {heading}:\n" + "\n\n".join(parts) + "\n\n"
+
+
 # ── Layer assemblers ──────────────────────────────────────────────────────────
 
 async def _assemble_layer_a(session: SessionState) -> LayerA:
-    hyp_ctx = _hypotheses_context(session)
-    prior_ctx_parts = []
-    if session.screen_context:
-        prior_ctx_parts.append(f"### Скрининг:\n{session.screen_context[:800]}")
-    if session.interpreter_context:
-        prior_ctx_parts.append(f"### Интерпретация:\n{session.interpreter_context[:800]}")
-    prior_ctx = (
-        "\n\n## Дополнительный контекст кейса:\n" + "\n\n".join(prior_ctx_parts) + "\n\n"
-        if prior_ctx_parts else ""
-    )
-    user_message = (
-        f"{hyp_ctx}"
-        f"{prior_ctx}\n"
-        "На основе этих гипотез создай Layer A - техническую модель для специалиста.\n\n"
-        "КРИТИЧЕСКИ ВАЖНО:\n"
-        "1. Dominant layer - определи по УПРАВЛЯЮЩЕМУ КОНФЛИКТУ, не по частоте упоминаний\n"
-        "2. Configuration - покажи петли со СТРЕЛКАМИ (A→B→C), не абзацем\n"
-        "3. System cost - конкретная цена для L0, L3, L4"
-    )
-    client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+    user_message = _LAYER_A_USER_TEMPLATE.format_map({
+        "hypotheses": _hypotheses_context(session),
+        "prior_context": _prior_context(session, "Дополнительный контекст кейса", 800),
+    })
+    client = get_anthropic_client()
     resp = await client.messages.create(
         model=_ANTHROPIC_MODEL,
         max_tokens=4096,
@@ -282,7 +303,7 @@ async def _assemble_layer_a(session: SessionState) -> LayerA:
         configuration_summary=data["configuration_summary"],
         system_cost=system_cost,
     )
-    logger.info(f"[conceptualizator] Layer A done. Dominant: {layer_a.dominant_layer.value}")
+    logger.info("[conceptualizator] Layer A done. Dominant: %s", layer_a.dominant_layer.value)
     return layer_a
 
 
@@ -296,26 +317,11 @@ async def _assemble_layer_b(session: SessionState) -> LayerB:
         levels_str = ", ".join(l.value for l in hyp.levels)
         context_lines.append(f"[{levels_str}] {hyp.formulation}\n")
 
-    prior_ctx_parts = []
-    if session.screen_context:
-        prior_ctx_parts.append(f"### Скрининг:\n{session.screen_context[:600]}")
-    if session.interpreter_context:
-        prior_ctx_parts.append(f"### Интерпретация:\n{session.interpreter_context[:600]}")
-    prior_ctx = (
-        "\n\n## Дополнительный контекст:\n" + "\n\n".join(prior_ctx_parts) + "\n\n"
-        if prior_ctx_parts else ""
-    )
-
-    user_message = (
-        "\n".join(context_lines)
-        + prior_ctx + "\n"
-        "На основе этих управленческих гипотез создай Layer B - мишени вмешательства.\n\n"
-        "КРИТИЧЕСКИ ВАЖНО:\n"
-        "- Direction = ЧТО должно измениться, НЕ описание паттерна!\n"
-        "- Формулировки конкретные и actionable\n"
-        "- Приоритеты: L0 = 1-2, L4 = 4-5"
-    )
-    client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+    user_message = _LAYER_B_USER_TEMPLATE.format_map({
+        "hypotheses": "\n".join(context_lines),
+        "prior_context": _prior_context(session, "Дополнительный контекст", 600),
+    })
+    client = get_anthropic_client()
     resp = await client.messages.create(
         model=_ANTHROPIC_MODEL,
         max_tokens=4096,
@@ -335,7 +341,7 @@ async def _assemble_layer_b(session: SessionState) -> LayerB:
         for t in data["targets"]
     ]
     layer_b = LayerB(targets=targets, sequencing_notes=data["sequencing_notes"])
-    logger.info(f"[conceptualizator] Layer B done. Targets: {len(targets)}")
+    logger.info("[conceptualizator] Layer B done. Targets: %d", len(targets))
     return layer_b
 
 
@@ -344,15 +350,10 @@ async def _assemble_layer_c(session: SessionState) -> LayerC:
     for hyp in session.get_active_hypotheses():
         context_lines.append(f"{hyp.type.value}: {hyp.formulation}\n")
 
-    user_message = (
-        "\n".join(context_lines) + "\n\n"
-        "На основе этого понимания создай Layer C - метафорический нарратив для клиента.\n\n"
-        "КРИТИЧЕСКИ ВАЖНО:\n"
-        "- Метафора должна схватывать УПРАВЛЯЮЩИЙ КОНФЛИКТ, не симптом\n"
-        "- Нарратив на языке ОПЫТА, без L0-L4, гипотез, диагнозов\n"
-        "- Клиент должен узнать себя"
-    )
-    client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+    user_message = _LAYER_C_USER_TEMPLATE.format_map({
+        "hypotheses": "\n".join(context_lines),
+    })
+    client = get_anthropic_client()
     resp = await client.messages.create(
         model=_ANTHROPIC_MODEL,
         max_tokens=4096,
@@ -367,7 +368,7 @@ async def _assemble_layer_c(session: SessionState) -> LayerC:
         narrative=data["narrative"],
         direction_of_change=data["direction_of_change"],
     )
-    logger.info(f"[conceptualizator] Layer C done. Metaphor: {layer_c.core_metaphor}")
+    logger.info("[conceptualizator] Layer C done. Metaphor: %s", layer_c.core_metaphor)
     return layer_c
 
 
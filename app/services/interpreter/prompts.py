@@ -292,6 +292,16 @@ Structured Results JSON with restricted content and maximum caution."""
 
 # ===== PROMPT ASSEMBLY =====
 
+_STATE_PROMPTS = {
+    "INTAKE": INTAKE_PROMPT,
+    "MATERIAL_CHECK": MATERIAL_CHECK_PROMPT,
+    "CLARIFICATION_LOOP": CLARIFICATION_LOOP_PROMPT,
+    "QUESTIONS_GENERATION": QUESTIONS_GENERATION_PROMPT,
+    "INTERPRETATION_GENERATION": INTERPRETATION_GENERATION_PROMPT,
+    "LOW_DATA_MODE": LOW_DATA_MODE_PROMPT,
+}
+
+
 def assemble_prompt(state: str, session_context: dict) -> str:
     """
     Assemble complete system prompt for a given FSM state.
@@ -303,16 +313,7 @@ def assemble_prompt(state: str, session_context: dict) -> str:
     Returns:
         Complete prompt string to use as the system prompt.
     """
-    state_prompts = {
-        "INTAKE": INTAKE_PROMPT,
-        "MATERIAL_CHECK": MATERIAL_CHECK_PROMPT,
-        "CLARIFICATION_LOOP": CLARIFICATION_LOOP_PROMPT,
-        "QUESTIONS_GENERATION": QUESTIONS_GENERATION_PROMPT,
-        "INTERPRETATION_GENERATION": INTERPRETATION_GENERATION_PROMPT,
-        "LOW_DATA_MODE": LOW_DATA_MODE_PROMPT,
-    }
-
-    state_prompt = state_prompts.get(state, "")
+    state_prompt = _STATE_PROMPTS.get(state, "")
 
     return f"""{BASE_SYSTEM_PROMPT}
 
@@ -25,6 +25,48 @@ _REQUIRED_FIELDS = [
 ]
 
 
+# Display labels for the TXT report; built once, not per format_to_txt() call.
+_MATERIAL_TYPES: dict[str, str] = {
+    "dream": "Сон",
+    "drawing": "Рисунок",
+    "image_series": "Серия образов",
+    "mixed": "Смешанный",
+}
+
+_SOURCES: dict[str, str] = {
+    "client_report": "Рассказ клиента",
+    "specialist_observation": "Наблюдение специалиста",
+    "therapeutic_session": "Терапевтическая сессия",
+}
+
+_COMPLETENESS: dict[str, str] = {
+    "sufficient": "Достаточно",
+    "partial": "Частично",
+    "fragmentary": "Фрагментарно",
+}
+
+_DOMAIN_NAMES: dict[str, str] = {
+    "safety_and_protection": "Безопасность и защита",
+    "connection_and_belonging": "Связь и принадлежность",
+    "autonomy_and_control": "Автономия и контроль",
+    "change_and_uncertainty": "Изменения и неопределённость",
+    "identity_and_continuity": "Идентичность и непрерывность",
+    "meaning_and_purpose": "Смысл и цель",
+    "resource_management": "Управление ресурсами",
+}
+
+_PATTERN_NAMES: dict[str, str] = {
+    "distancing": "Дистанцирование",
+    "control_seeking": "Поиск контроля",
+    "symbolic_repair": "Символическое восстановление",
+    "affect_modulation": "Модуляция аффекта",
+    "fragmentation": "Фрагментация",
+    "idealization": "Идеализация",
+    "externalization": "Экстернализация",
+    "other": "Другое",
+}
+
+
 def validate_structured_results(data: Dict[str, Any]) -> Tuple[bool, list[str]]:
     """
     Validate Structured Results JSON against schema.
@@ -94,29 +136,12 @@ def format_to_txt(data: Dict[str, Any]) -> str:
 
     # ── Input summary ─────────────────────────────────────────────────────────
     input_sum = data.get("input_summary", {})
-    material_types = {
-        "dream": "Сон",
-        "drawing": "Рисунок",
-        "image_series": "Серия образов",
-        "mixed": "Смешанный",
-    }
-    sources = {
-        "client_report": "Рассказ клиента",
-        "specialist_observation": "Наблюдение специалиста",
-        "therapeutic_session": "Терапевтическая сессия",
-    }
-    completeness_map = {
-        "sufficient": "Достаточно",
-        "partial": "Частично",
-        "fragmentary": "Фрагментарно",
-    }
-
     lines += [
         "ИСХОДНЫЙ МАТЕРИАЛ",
         "",
-        f"Тип материала: {material_types.get(input_sum.get('material_type', ''), 'Не указано')}",
-        f"Источник: {sources.get(input_sum.get('source', ''), 'Не указан')}",
-        f"Полнота данных: {completeness_map.get(input_sum.get('completeness', ''), 'Не указана')}",
+        f"Тип материала: {_MATERIAL_TYPES.get(input_sum.get('material_type', ''), 'Не указано')}",
+        f"Источник: {_SOURCES.get(input_sum.get('source', ''), 'Не указан')}",
+        f"Полнота данных: {_COMPLETENESS.get(input_sum.get('completeness', ''), 'Не указана')}",
     ]
 
     clarifications = input_sum.get("clarifications_received", [])
@@ -190,16 +215,6 @@ def format_to_txt(data: Dict[str, Any]) -> str:
     focus = data.get("focus_of_tension") or data.get("clinical_directions") or {}
     lines += ["ОБЛАСТИ НАПРЯЖЕНИЯ", ""]
 
-    domain_names = {
-        "safety_and_protection": "Безопасность и защита",
-        "connection_and_belonging": "Связь и принадлежность",
-        "autonomy_and_control": "Автономия и контроль",
-        "change_and_uncertainty": "Изменения и неопределённость",
-        "identity_and_continuity": "Идентичность и непрерывность",
-        "meaning_and_purpose": "Смысл и цель",
-        "resource_management": "Управление ресурсами",
-    }
-
     if isinstance(focus, str):
         if focus:
             lines.append(focus)
@@ -211,7 +226,7 @@ def format_to_txt(data: Dict[str, Any]) -> str:
         if domains:
             lines.append("Домены:")
             for d in domains:
-                lines.append(f"  • {domain_names.get(d, d)}")
+                lines.append(f"  • {_DOMAIN_NAMES.get(d, d)}")
 
         indicators = focus.get("indicators", [])
         if indicators:
@@ -233,21 +248,11 @@ def format_to_txt(data: Dict[str, Any]) -> str:
     # ── Compensatory patterns ─────────────────────────────────────────────────
     patterns = data.get("compensatory_patterns", [])
     if patterns:
-        pattern_names = {
-            "distancing": "Дистанцирование",
-            "control_seeking": "Поиск контроля",
-            "symbolic_repair": "Символическое восстановление",
-            "affect_modulation": "Модуляция аффекта",
-            "fragmentation": "Фрагментация",
-            "idealization": "Идеализация",
-            "externalization": "Экстернализация",
-            "other": "Другое",
-        }
         lines += ["КОМПЕНСАТОРНЫЕ ПАТТЕРНЫ", ""]
         for patt in patterns:
             if isinstance(patt, dict):
                 lines.append(
-                    f"• {pattern_names.get(patt.get('pattern', ''), patt.get('pattern', 'N/A'))} "
+                    f"• {_PATTERN_NAMES.get(patt.get('pattern', ''), patt.get('pattern', 'N/A'))} "
                     f"({patt.get('confidence', 'N/A')})"
                 )
                 if patt.get("evidence"):
@@ -70,7 +70,8 @@ async def verify_link(
         raise LinkVerifyError("Token not found")
     if token.used_at is not None:
         raise LinkVerifyError("Token already used")
-    if datetime.now(timezone.utc) > token.expires_at:
+    now = datetime.now(timezone.utc)
+    if now > token.expires_at:
         raise LinkVerifyError("Token expired")
     if token.service_id != service_id:
         raise LinkVerifyError("Token not valid for this service")
@@ -81,6 +82,6 @@ async def verify_link(
     if token.role == "client" and token.service_id != "screen":
         raise LinkVerifyError("Client token cannot be used with non-screen service")
 
-    token.used_at = datetime.now(timezone.utc)
+    token.used_at = now
     await db.flush()
     return token
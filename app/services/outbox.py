@@ -16,7 +16,6 @@ tg_method values:
   "edit_message"    → Bot.edit_message_text(**payload)
 """
 import base64
-import io
 import logging
 import uuid
 from datetime import datetime, timezone
@@ -24,13 +23,30 @@ from datetime import datetime, timezone
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from telegram import Bot, InputFile, InlineKeyboardMarkup
+from telegram.error import RetryAfter
 
+from app.config import settings
 from app.models.outbox_message import OutboxMessage
+from app.utils.rate_limit import AdaptiveTokenBucket, retry_after_seconds
 
 logger = logging.getLogger(__name__)
 
 _MAX_ERROR_LEN = 2000
 
+# Per-bot pacing below Telegram's ~30 msg/sec limit; adapts down on 429s.
+# The bucket lives in this process only, so the rate is split across worker
+# replicas. Webhook replies go out unpaced from the web process and are not
+# counted here.
+_SEND_RATE = 25.0 / max(1, settings.WORKER_REPLICAS)
+_buckets: dict[str, AdaptiveTokenBucket] = {}
+
+
+def _bucket_for(bot_id: str) -> AdaptiveTokenBucket:
+    bucket = _buckets.get(bot_id)
+    if bucket is None:
+        bucket = _buckets[bot_id] = AdaptiveTokenBucket(_SEND_RATE)
+    return bucket
+
 
 # ── Enqueue ───────────────────────────────────────────────────────────────────
 
@@ -69,6 +85,41 @@ async def enqueue_message(
     return msg
 
 
+async def enqueue_messages(
+    db: AsyncSession,
+    bot_id: str,
+    chat_id: int,
+    items: list[tuple[str, dict]],
+    *,
+    job_id: uuid.UUID | None = None,
+) -> list[OutboxMessage]:
+    """
+    Persist several outbox messages for one chat with a single flush.
+
+    items: [(tg_method, payload), ...] — seq is assigned from list order.
+    Equivalent to calling enqueue_message() per item, but the INSERTs go
+    out as one batch instead of one round-trip each.
+    """
+    msgs = [
+        OutboxMessage(
+            job_id=job_id,
+            bot_id=bot_id,
+            chat_id=chat_id,
+            tg_method=tg_method,
+            payload=payload,
+            seq=seq,
+        )
+        for seq, (tg_method, payload) in enumerate(items)
+    ]
+    db.add_all(msgs)
+    await db.flush()
+    logger.debug(
+        "outbox.enqueue_many count=%d bot=%s chat=%s job=%s",
+        len(msgs), bot_id, chat_id, job_id,
+    )
+    return msgs
+
+
 # ── Dispatch ──────────────────────────────────────────────────────────────────
 
 async def dispatch_one(db: AsyncSession, bots: dict[str, Bot]) -> bool:
@@ -100,14 +151,28 @@ async def dispatch_one(db: AsyncSession, bots: dict[str, Bot]) -> bool:
         logger.error("outbox.no_bot msg_id=%s bot_id=%s", msg.msg_id, msg.bot_id)
         return True
 
+    bucket = _bucket_for(msg.bot_id)
     try:
+        await bucket.acquire()
         await _send(bot, msg.tg_method, dict(msg.payload))
+        bucket.on_success()
         msg.status = "sent"
         msg.sent_at = now
         logger.info(
             "outbox.sent msg_id=%s method=%s bot=%s chat=%s",
             msg.msg_id, msg.tg_method, msg.bot_id, msg.chat_id,
         )
+    except RetryAfter as exc:
+        # Throttled, not failed: slow the bucket down and retry later without
+        # spending one of the message's delivery attempts.
+        retry_after = retry_after_seconds(exc.retry_after)
+        bucket.on_throttled(retry_after)
+        msg.attempts -= 1
+        msg.last_error = str(exc)[:_MAX_ERROR_LEN]
+        logger.warning(
+            "outbox.throttled msg_id=%s bot=%s retry_after=%.1fs rate=%.1f/s",
+            msg.msg_id, msg.bot_id, retry_after, bucket.rate,
+        )
     except Exception as exc:
         error = str(exc)[:_MAX_ERROR_LEN]
         msg.last_error = error
@@ -147,7 +212,7 @@ async def _send(bot: Bot, tg_method: str, payload: dict) -> None:
         filename = payload.pop("filename", "file")
         if doc_b64 is not None:
             raw = base64.b64decode(doc_b64)
-            payload["document"] = InputFile(io.BytesIO(raw), filename=filename)
+            payload["document"] = InputFile(raw, filename=filename)
         await bot.send_document(**payload)
 
     elif tg_method == "edit_message":
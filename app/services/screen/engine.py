@@ -14,6 +14,16 @@ _POLARIZATION_THRESHOLD = 0.7     # |axis_score| above this → polarized
 _LOW_VARIANCE_STD_REF = 0.3       # std reference for low-variance normalization
 _STABILITY_STD_REF = 0.5          # std reference for confidence stability
 
+# The 5×4 cell grid is fixed, so its key strings are built once here rather
+# than formatted/split on every recompute: (cell, layer, axis, zone) where
+# cell is "L{k}_A{j}" and zone is the ambiguity-zone form "A{j}_L{k}".
+_CELLS: tuple[tuple[str, str, str, str], ...] = tuple(
+    (f"{layer}_{axis}", layer, axis, f"{axis}_{layer}")
+    for layer in LAYERS
+    for axis in AXES
+)
+_CELL_TO_ZONE: dict[str, str] = {cell: zone for cell, _, _, zone in _CELLS}
+
 
 def classify_axis_intensity(axis_vector: dict) -> dict:
     """Classify intensity of each axis score.
@@ -118,6 +128,31 @@ def analyze_horizontal_coherence(tension_matrix: dict) -> dict:
     return result
 
 
+def _avg_axis_std(responses: list[dict]) -> float:
+    """Mean over AXES of the population std of per-response axis weights.
+
+    Single pass over responses accumulating a running sum and sum of squares
+    per axis (var = E[w²] - E[w]²) instead of a mean pass plus a deviation
+    pass for every axis.
+    """
+    n = len(responses)
+    if not n:
+        return 0.0
+    sums = [0.0] * len(AXES)
+    sums_sq = [0.0] * len(AXES)
+    for r in responses:
+        weights = r.get("axis_weights", {})
+        for i, a in enumerate(AXES):
+            w = weights.get(a, 0.0)
+            sums[i] += w
+            sums_sq[i] += w * w
+    total = 0.0
+    for total_w, total_sq in zip(sums, sums_sq):
+        mean_w = total_w / n
+        total += math.sqrt(max(0.0, total_sq / n - mean_w * mean_w))
+    return total / len(AXES)
+
+
 class ScreeningEngine:
     """Stateless vector computation engine for Screen v2 screening assessments."""
 
@@ -138,17 +173,20 @@ class ScreeningEngine:
         n = len(responses)
         scale = math.sqrt(n)
 
-        raw_axis = {
-            a: sum(r.get("axis_weights", {}).get(a, 0.0) for r in responses) / scale
-            for a in AXES
-        }
-        raw_layer = {
-            l: sum(r.get("layer_weights", {}).get(l, 0.0) for r in responses) / scale
-            for l in LAYERS
-        }
+        # One pass over responses; each response only touches the keys it
+        # actually weights instead of 9 separate scans of the whole history.
+        raw_axis = dict.fromkeys(AXES, 0.0)
+        raw_layer = dict.fromkeys(LAYERS, 0.0)
+        for r in responses:
+            for a, w in r.get("axis_weights", {}).items():
+                if a in raw_axis:
+                    raw_axis[a] += w
+            for l, w in r.get("layer_weights", {}).items():
+                if l in raw_layer:
+                    raw_layer[l] += w
 
-        axis_vector = {a: math.tanh(v) for a, v in raw_axis.items()}
-        layer_vector = {l: math.tanh(v) for l, v in raw_layer.items()}
+        axis_vector = {a: math.tanh(v / scale) for a, v in raw_axis.items()}
+        layer_vector = {l: math.tanh(v / scale) for l, v in raw_layer.items()}
 
         return axis_vector, layer_vector
 
@@ -158,15 +196,17 @@ class ScreeningEngine:
 
         Returns dict with keys "L{k}_A{j}" for k in 0..4, j in 1..4  (20 cells).
         """
-        matrix = {}
-        for k in range(5):
-            for j in range(1, 5):
-                key = f"L{k}_A{j}"
-                matrix[key] = layer_vector.get(f"L{k}", 0.0) * axis_vector.get(f"A{j}", 0.0)
-        return matrix
+        return {
+            cell: layer_vector.get(layer, 0.0) * axis_vector.get(axis, 0.0)
+            for cell, layer, axis, _ in _CELLS
+        }
 
     @staticmethod
-    def compute_rigidity(responses: list[dict], axis_vector: dict) -> dict:
+    def compute_rigidity(
+        responses: list[dict],
+        axis_vector: dict,
+        avg_std: float | None = None,
+    ) -> dict:
         """Compute rigidity index from response history and normalised axis vector.
 
         Components:
@@ -177,6 +217,8 @@ class ScreeningEngine:
                                 positive/negative sign pattern across all axes
 
         Total = 0.3 * polarization + 0.3 * low_variance + 0.4 * strategy_repetition
+
+        avg_std may be passed in when already computed for the same responses.
         """
         if not responses:
             return {
@@ -195,13 +237,8 @@ class ScreeningEngine:
         )
 
         # Low variance — low std across responses per axis means rigid behaviour
-        stds: list[float] = []
-        for a in AXES:
-            weights = [r.get("axis_weights", {}).get(a, 0.0) for r in responses]
-            mean_w = sum(weights) / n
-            variance = sum((w - mean_w) ** 2 for w in weights) / n
-            stds.append(math.sqrt(variance))
-        avg_std = sum(stds) / len(stds)
+        if avg_std is None:
+            avg_std = _avg_axis_std(responses)
         low_variance = max(0.0, min(1.0, 1.0 - avg_std / _LOW_VARIANCE_STD_REF))
 
         # Strategy repetition — dominant sign pattern frequency
@@ -227,6 +264,7 @@ class ScreeningEngine:
         responses: list[dict],
         axis_vector: dict,
         ambiguity_count: int,
+        avg_std: float | None = None,
     ) -> float:
         """Compute confidence score in [0, 1].
 
@@ -234,23 +272,18 @@ class ScreeningEngine:
         - coverage:   fraction of axes with meaningful signal (|score| > 0.2)
         - stability:  1 - normalised avg std of per-axis contributions
         - clarity:    1 - fraction of ambiguous cells out of all 20 cells
+
+        avg_std may be passed in when already computed for the same responses.
         """
         if not responses:
             return 0.0
 
-        n = len(responses)
-
         coverage = (
             sum(1 for a in AXES if abs(axis_vector.get(a, 0.0)) > 0.2) / len(AXES)
         )
 
-        stds: list[float] = []
-        for a in AXES:
-            weights = [r.get("axis_weights", {}).get(a, 0.0) for r in responses]
-            mean_w = sum(weights) / n
-            variance = sum((w - mean_w) ** 2 for w in weights) / n
-            stds.append(math.sqrt(variance))
-        avg_std = sum(stds) / len(stds)
+        if avg_std is None:
+            avg_std = _avg_axis_std(responses)
         stability = max(0.0, min(1.0, 1.0 - avg_std / _STABILITY_STD_REF))
 
         max_cells = len(AXES) * len(LAYERS)  # 20
@@ -272,8 +305,11 @@ class ScreeningEngine:
         for key, value in tension_matrix.items():
             if abs(value) < _AMBIGUITY_THRESHOLD:
                 # key is "L{k}_A{j}" → reformat to "A{j}_L{k}"
-                lpart, apart = key.split("_")
-                zones.append(f"{apart}_{lpart}")
+                zone = _CELL_TO_ZONE.get(key)
+                if zone is None:
+                    lpart, apart = key.split("_")
+                    zone = f"{apart}_{lpart}"
+                zones.append(zone)
         return zones
 
     @staticmethod
@@ -297,14 +333,28 @@ class ScreeningEngine:
                 response_history, axis_vector, layer_vector, tension_matrix,
                 ambiguity_zones, rigidity, confidence, dominant_cells.
         """
+        return cls.process_responses(current_state, [new_response])
+
+    @classmethod
+    def process_responses(cls, current_state: dict, new_responses: list[dict]) -> dict:
+        """Append a batch of responses and recompute derived metrics once.
+
+        Equivalent to folding process_response over new_responses, but the
+        history is copied once and the metrics are computed only for the
+        final history (intermediate results would be discarded anyway).
+        Does not mutate current_state.
+        """
         responses = list(current_state.get("response_history", []))
-        responses.append(new_response)
+        responses.extend(new_responses)
 
         axis_vector, layer_vector = cls.aggregate_vectors(responses)
         tension_matrix = cls.compute_tension_matrix(axis_vector, layer_vector)
         ambiguity_zones = cls.find_ambiguity_zones(axis_vector, layer_vector, tension_matrix)
-        rigidity = cls.compute_rigidity(responses, axis_vector)
-        confidence = cls.compute_confidence(responses, axis_vector, len(ambiguity_zones))
+        avg_std = _avg_axis_std(responses)
+        rigidity = cls.compute_rigidity(responses, axis_vector, avg_std)
+        confidence = cls.compute_confidence(
+            responses, axis_vector, len(ambiguity_zones), avg_std
+        )
         dominant_cells = cls.get_dominant_cells(tension_matrix)
 
         return {
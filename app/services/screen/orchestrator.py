@@ -10,17 +10,21 @@ All DB work uses the injected AsyncSession; the caller must commit.
 """
 from __future__ import annotations
 
-import json
+import asyncio
+import contextlib
 import logging
 from datetime import datetime, timezone
 from uuid import UUID
 
-import anthropic
-from sqlalchemy import select, update
+from sqlalchemy import literal, select, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import defer
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import settings
+from app.utils.json_fence import loads_json_response
 from app.models.screening_assessment import ScreeningAssessment
+from app.services.anthropic_client import get_anthropic_client
+from app.services.screen import report as report_module
 from app.services.screen import screen_bank
 from app.services.screen.engine import (
     ScreeningEngine,
@@ -49,10 +53,12 @@ _MAX_PHASE3_QUESTIONS = 5
 class ScreenOrchestrator:
     """Stateless phase orchestrator — one instance per request is fine."""
 
+    __slots__ = ("db", "engine", "client")
+
     def __init__(self, db: AsyncSession) -> None:
         self.db = db
         self.engine = ScreeningEngine()
-        self.client = anthropic.AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+        self.client = get_anthropic_client()
 
     # ------------------------------------------------------------------
     # Public API
@@ -63,8 +69,15 @@ class ScreenOrchestrator:
 
         Raises ValueError if the assessment does not exist.
         """
+        # The final report columns are never read here and can be large;
+        # deferring them keeps them out of the per-answer SELECT.
         result = await self.db.execute(
-            select(ScreeningAssessment).where(ScreeningAssessment.id == assessment_id)
+            select(ScreeningAssessment)
+            .where(ScreeningAssessment.id == assessment_id)
+            .options(
+                defer(ScreeningAssessment.report_json),
+                defer(ScreeningAssessment.report_text),
+            )
         )
         assessment = result.scalar_one_or_none()
         if assessment is None:
@@ -118,18 +131,22 @@ class ScreenOrchestrator:
     ) -> dict:
         """Process a Phase 1 multi-select answer and advance the session."""
         state = await self.get_or_create_session_state(assessment_id)
+        history_len = len(state["response_history"])
         screen = screen_bank.get_phase1_screen(screen_index)
 
         # Each selected option becomes an independent response for the engine
-        for idx in selected_options:
-            option = screen["options"][idx]
-            response = {
-                "axis_weights": option["axis_weights"],
-                "layer_weights": option["layer_weights"],
+        options = screen["options"]
+        responses = [
+            {
+                "axis_weights": options[idx]["axis_weights"],
+                "layer_weights": options[idx]["layer_weights"],
             }
-            state = self.engine.process_response(state, response)
+            for idx in selected_options
+        ]
+        if responses:
+            state = self.engine.process_responses(state, responses)
 
-        await self._save_engine_state(assessment_id, state)
+        await self._save_engine_state(assessment_id, state, history_len)
 
         if screen_index < 5:
             next_screen = screen_bank.get_phase1_screen(screen_index + 1)
@@ -140,24 +157,21 @@ class ScreenOrchestrator:
                 "phase": 1,
             }
 
-        # Last Phase 1 screen — decide what comes next
+        # Last Phase 1 screen — decide what comes next (one UPDATE for both outcomes)
+        complete = state["confidence"] >= _CONFIDENCE_THRESHOLD
+        values: dict = {"phase1_completed": True}
+        if not complete:
+            values.update(phase=2, phase2_questions=0)
         await self.db.execute(
             update(ScreeningAssessment)
             .where(ScreeningAssessment.id == assessment_id)
-            .values(phase1_completed=True)
+            .values(**values)
         )
         await self.db.flush()
 
-        if state["confidence"] >= _CONFIDENCE_THRESHOLD:
+        if complete:
             return {"action": "complete"}
 
-        await self.db.execute(
-            update(ScreeningAssessment)
-            .where(ScreeningAssessment.id == assessment_id)
-            .values(phase=2, phase2_questions=0)
-        )
-        await self.db.flush()
-
         question_screen = await self._select_next_phase2_question(state)
         return {"action": "show_screen", "screen": question_screen, "phase": 2}
 
@@ -169,27 +183,48 @@ class ScreenOrchestrator:
     ) -> dict:
         """Process one Phase 2 adaptive response."""
         state = await self.get_or_create_session_state(assessment_id)
+        history_len = len(state["response_history"])
         prev_axis_vector = dict(state.get("axis_vector", {}))
 
-        for idx in selected_options:
-            option = current_screen["options"][idx]
-            response = {
-                "axis_weights": option["axis_weights"],
-                "layer_weights": option["layer_weights"],
-                "node": current_screen.get("node"),  # tracked for dedup
+        options = current_screen["options"]
+        node = current_screen.get("node")  # tracked for dedup
+        responses = [
+            {
+                "axis_weights": options[idx]["axis_weights"],
+                "layer_weights": options[idx]["layer_weights"],
+                "node": node,
                 "phase": 2,
             }
-            state = {**state, **self.engine.process_response(state, response)}
+            for idx in selected_options
+        ]
+        if responses:
+            state = {**state, **self.engine.process_responses(state, responses)}
 
         new_q_count = state.get("phase2_questions", 0) + 1
         state["phase2_questions"] = new_q_count
-        await self._save_engine_state(assessment_id, state, phase2_questions=new_q_count)
-
-        stop = await self._check_stop_phase2(state, prev_axis_vector)
+        await self._save_engine_state(
+            assessment_id, state, history_len, phase2_questions=new_q_count
+        )
 
         exit_by_confidence = state.get("confidence", 0.0) >= _CONFIDENCE_THRESHOLD
         exit_by_count = new_q_count >= _MAX_PHASE2_QUESTIONS
-        exit_by_stop = stop and new_q_count >= _MIN_PHASE2_QUESTIONS
+
+        next_q_task: asyncio.Task | None = None
+        if exit_by_confidence or exit_by_count:
+            # Phase 2 ends regardless of what the stop module says.
+            stop = None
+        else:
+            # Route the likely next Phase 2 question while the stop module
+            # decides — both read only the updated state, so the two Claude
+            # calls overlap instead of running back to back.
+            next_q_task = asyncio.create_task(self._select_next_phase2_question(state))
+            try:
+                stop = await self._check_stop_phase2(state, prev_axis_vector)
+            except BaseException:
+                await _discard(next_q_task)
+                raise
+
+        exit_by_stop = bool(stop) and new_q_count >= _MIN_PHASE2_QUESTIONS
 
         logger.info(
             "[phase2] q=%d, max=%d, min=%d, conf=%.3f, stop=%s, "
@@ -200,6 +235,8 @@ class ScreenOrchestrator:
         )
 
         if exit_by_confidence or exit_by_count or exit_by_stop:
+            if next_q_task is not None:
+                await _discard(next_q_task)
             if exit_by_confidence:
                 return {"action": "complete"}
             # Exited by count or stop signal — move to Phase 3
@@ -212,7 +249,7 @@ class ScreenOrchestrator:
             q = await self._select_next_phase3_question(state)
             return {"action": "show_screen", "screen": q, "phase": 3}
 
-        q = await self._select_next_phase2_question(state)
+        q = await next_q_task
         return {"action": "show_screen", "screen": q, "phase": 2}
 
     async def process_phase3_response(
@@ -223,20 +260,27 @@ class ScreenOrchestrator:
     ) -> dict:
         """Process one Phase 3 constructor response."""
         state = await self.get_or_create_session_state(assessment_id)
-
-        for idx in selected_options:
-            option = current_screen["options"][idx]
-            response = {
-                "axis_weights": option["axis_weights"],
-                "layer_weights": option["layer_weights"],
-                "node": current_screen.get("node"),  # tracked for dedup
+        history_len = len(state["response_history"])
+
+        options = current_screen["options"]
+        node = current_screen.get("node")  # tracked for dedup
+        responses = [
+            {
+                "axis_weights": options[idx]["axis_weights"],
+                "layer_weights": options[idx]["layer_weights"],
+                "node": node,
                 "phase": 3,
             }
-            state = {**state, **self.engine.process_response(state, response)}
+            for idx in selected_options
+        ]
+        if responses:
+            state = {**state, **self.engine.process_responses(state, responses)}
 
         new_q_count = state["phase3_questions"] + 1
         state["phase3_questions"] = new_q_count
-        await self._save_engine_state(assessment_id, state, phase3_questions=new_q_count)
+        await self._save_engine_state(
+            assessment_id, state, history_len, phase3_questions=new_q_count
+        )
 
         if new_q_count >= _MAX_PHASE3_QUESTIONS or state["confidence"] >= _CONFIDENCE_THRESHOLD:
             return {"action": "complete"}
@@ -281,19 +325,9 @@ class ScreenOrchestrator:
                 logger.warning("[screen] Router JSON parse failed; using fallback node")
 
         try:
-            template = screen_bank.get_phase2_template(selected_node)
+            return screen_bank.get_phase2_screen(selected_node)
         except KeyError:
-            template = screen_bank.get_phase2_template(
-                screen_bank.get_all_phase2_nodes()[0]
-            )
-
-        return {
-            "question": template["reference_question"],
-            "options": template["options"],
-            "node": template["node"],
-            "diagnostic_split": template["diagnostic_split"],
-            "type": "multi_select",
-        }
+            return screen_bank.get_phase2_screen(screen_bank.get_all_phase2_nodes()[0])
 
     async def _select_next_phase3_question(self, state: dict) -> dict:
         """Use Claude (sonnet) to construct a deeper adaptive question."""
@@ -399,8 +433,6 @@ class ScreenOrchestrator:
 
     async def _generate_report(self, assessment_id: UUID) -> dict:
         """Generate and persist the final report."""
-        from app.services.screen import report as report_module
-
         state = await self.get_or_create_session_state(assessment_id)
 
         # Extend state with structural signals consumed by report generator
@@ -461,11 +493,17 @@ class ScreenOrchestrator:
         self,
         assessment_id: UUID,
         state: dict,
+        history_len: int,
         *,
         phase2_questions: int | None = None,
         phase3_questions: int | None = None,
     ) -> None:
-        """Persist engine vector state + optional counter overrides."""
+        """Persist engine vector state + optional counter overrides.
+
+        Only the responses added since load (past ``history_len``) are sent;
+        Postgres appends them with ``jsonb || jsonb`` instead of receiving the
+        whole history again on every answer.
+        """
         values: dict = {
             "axis_vector": state.get("axis_vector", {}),
             "layer_vector": state.get("layer_vector", {}),
@@ -474,8 +512,12 @@ class ScreenOrchestrator:
             "confidence": state.get("confidence", 0.0),
             "ambiguity_zones": state.get("ambiguity_zones", []),
             "dominant_cells": state.get("dominant_cells", []),
-            "response_history": state.get("response_history", []),
         }
+        appended = state.get("response_history", [])[history_len:]
+        if appended:
+            values["response_history"] = ScreeningAssessment.response_history.op("||")(
+                literal(appended, JSONB)
+            )
         if phase2_questions is not None:
             values["phase2_questions"] = phase2_questions
         if phase3_questions is not None:
@@ -502,7 +544,7 @@ class ScreenOrchestrator:
         all_nodes = screen_bank.get_all_phase2_nodes()
         # Prefer ambiguity zones (most diagnostic) — skip already asked
         for node in state.get("ambiguity_zones", []):
-            if node not in exclude and node in all_nodes:
+            if node not in exclude and screen_bank.is_phase2_node(node):
                 return node
         # Fall back to any Phase 2 node not yet asked
         for node in all_nodes:
@@ -517,12 +559,12 @@ class ScreenOrchestrator:
 # ---------------------------------------------------------------------------
 
 def _parse_json(text: str) -> dict:
-    """Strip optional markdown fences then parse JSON."""
-    t = text.strip()
-    if t.startswith("```json"):
-        t = t[7:]
-    if t.startswith("```"):
-        t = t[3:]
-    if t.endswith("```"):
-        t = t[:-3]
-    return json.loads(t.strip())
+    """Parse JSON from a Claude reply (markdown fences / surrounding prose allowed)."""
+    return loads_json_response(text)
+
+
+async def _discard(task: asyncio.Task) -> None:
+    """Cancel a speculative task and wait for it, dropping its result or error."""
+    task.cancel()
+    with contextlib.suppress(asyncio.CancelledError, Exception):
+        await task
@@ -4,14 +4,27 @@ Three public callables:
   generate_full_report  — async; calls Claude twice, assembles report_json + report_text
   format_report_txt     — pure; formats report_json into a readable Russian plain-text
   generate_report_docx  — async; builds a professional DOCX from report_json
+                          in a worker thread (python-docx is CPU-bound)
 """
 from __future__ import annotations
 
+import asyncio
 import io
-import json
 import logging
 from datetime import datetime, timezone
 
+from docx import Document
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.shared import Pt, RGBColor
+
+from app.services.screen.prompts import (
+    CLIENT_REPORT_PROMPT,
+    REPORT_GENERATOR_PROMPT,
+    SESSION_BRIDGE_PROMPT,
+    assemble_prompt,
+)
+from app.utils.json_fence import loads_json_response
+
 logger = logging.getLogger(__name__)
 
 _SONNET = "claude-sonnet-4-5-20250929"
@@ -79,6 +92,15 @@ def _rigidity_label(total: float) -> str:
 # 1. generate_full_report
 # ---------------------------------------------------------------------------
 
+# Fallback shapes for the error path: keys are fixed, lists are created fresh
+# per call so report_json never shares mutable state between assessments.
+_INTERVIEW_PROTOCOL_KEYS = ("axis_verification", "layer_exploration", "functional_context")
+
+
+def _no_compression() -> dict:
+    return {"compressed": False, "features": []}
+
+
 def build_structural_summary(data: dict) -> dict:
     """Build deterministic structural signals for the LLM layer.
 
@@ -94,6 +116,9 @@ def build_structural_summary(data: dict) -> dict:
             "adaptive_depth": bool,
         }
     """
+    compression_profile = data.get("compression_profile")
+    if compression_profile is None:
+        compression_profile = _no_compression()
     return {
         "central_axis": data.get("vertical_profile", {}).get("axis"),
         "vertical_integration": data.get("vertical_profile", {}).get("is_vertical_integrated", False),
@@ -101,7 +126,7 @@ def build_structural_summary(data: dict) -> dict:
         "strategy_repetition": data.get("rigidity", {}).get("strategy_repetition", 0.0),
         "adaptive_depth": data.get("phase_depth", {}).get("phase3", 0) > 0,
         "axis_intensity": data.get("axis_intensity", {}),
-        "compression_profile": data.get("compression_profile", {"compressed": False, "features": []}),
+        "compression_profile": compression_profile,
     }
 
 
@@ -112,13 +137,11 @@ async def generate_client_summary(state: dict, claude_client) -> str:
     called from generate_full_report). Returns plain text in Russian or an
     empty string on failure.
     """
-    from app.services.screen.prompts import CLIENT_REPORT_PROMPT, assemble_prompt
-
     structural_summary = build_structural_summary(state)
     context = {
         "StructuralSummary": structural_summary,
         "Confidence": state.get("confidence", 0.0),
-        "CompressionProfile": structural_summary.get("compression_profile", {"compressed": False, "features": []}),
+        "CompressionProfile": structural_summary["compression_profile"],
     }
     user_content = assemble_prompt("client_report", context)
     result = await _call_claude(
@@ -143,12 +166,6 @@ async def generate_full_report(state: dict, claude_client) -> dict:
     Returns:
         {"report_json": dict, "report_text": str}
     """
-    from app.services.screen.prompts import (
-        REPORT_GENERATOR_PROMPT,
-        SESSION_BRIDGE_PROMPT,
-        assemble_prompt,
-    )
-
     # ---- 1. Structural report (Claude sonnet) ----------------------------
     structural_summary = build_structural_summary(state)
     report_context = {
@@ -160,7 +177,7 @@ async def generate_full_report(state: dict, claude_client) -> dict:
         "Confidence": state.get("confidence", 0.0),
         "StructuralSummary": structural_summary,
         "AxisIntensity": structural_summary.get("axis_intensity", {}),
-        "CompressionProfile": structural_summary.get("compression_profile", {"compressed": False, "features": []}),
+        "CompressionProfile": structural_summary["compression_profile"],
     }
     report_user = assemble_prompt("report", report_context)
     structural_report = await _call_claude(
@@ -196,7 +213,7 @@ async def generate_full_report(state: dict, claude_client) -> dict:
             interview_protocol = _parse_json(bridge_raw)
         except Exception:
             logger.warning("[screen] Session bridge JSON parse failed; leaving empty")
-            interview_protocol = {"axis_verification": [], "layer_exploration": [], "functional_context": []}
+            interview_protocol = {key: [] for key in _INTERVIEW_PROTOCOL_KEYS}
 
     # ---- 3. Client-facing summary (Claude sonnet) ------------------------
     client_summary = await generate_client_summary(state, claude_client)
@@ -223,7 +240,7 @@ async def generate_full_report(state: dict, claude_client) -> dict:
         "horizontal_profile": state.get("horizontal_profile", {}),
         "phase_depth": state.get("phase_depth", {}),
         "axis_intensity": structural_summary.get("axis_intensity", {}),
-        "compression_profile": structural_summary.get("compression_profile", {"compressed": False, "features": []}),
+        "compression_profile": structural_summary["compression_profile"],
     }
 
     report_text = format_report_txt(report_json)
@@ -319,11 +336,15 @@ def format_report_txt(report_json: dict) -> str:
 # ---------------------------------------------------------------------------
 
 async def generate_report_docx(report_json: dict) -> bytes:
-    """Build a professional DOCX report from report_json and return as bytes."""
-    from docx import Document
-    from docx.shared import Pt, RGBColor
-    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    """Build a professional DOCX report from report_json and return as bytes.
+
+    Rendering runs in a thread so a large report does not stall the event
+    loop (and every other webhook handler) while python-docx works.
+    """
+    return await asyncio.to_thread(_build_report_docx, report_json)
+
 
+def _build_report_docx(report_json: dict) -> bytes:
     doc = Document()
 
     def _set_font(run, size: int = 11, bold: bool = False) -> None:
@@ -501,11 +522,4 @@ async def _call_claude(
 
 
 def _parse_json(text: str) -> dict:
-    t = text.strip()
-    if t.startswith("```json"):
-        t = t[7:]
-    if t.startswith("```"):
-        t = t[3:]
-    if t.endswith("```"):
-        t = t[:-3]
-    return json.loads(t.strip())
+    return loads_json_response(text)
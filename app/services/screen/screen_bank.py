@@ -6,10 +6,26 @@ defined in weight_matrix.py.
 
 from app.services.screen.weight_matrix import (
     PHASE1_SCREENS,
-    PHASE2_TEMPLATES,
     _PHASE2_INDEX,
 )
 
+# Node keys in definition order; dicts preserve insertion order, so this is
+# derived from the existing index instead of re-walking PHASE2_TEMPLATES.
+_PHASE2_NODES: tuple[str, ...] = tuple(_PHASE2_INDEX)
+
+# Display screens for Phase 2 nodes, built once at import. Like
+# PHASE1_SCREENS, callers receive the shared dict and must not mutate it.
+_PHASE2_SCREENS: dict[str, dict] = {
+    node: {
+        "question": template["reference_question"],
+        "options": template["options"],
+        "node": template["node"],
+        "diagnostic_split": template["diagnostic_split"],
+        "type": "multi_select",
+    }
+    for node, template in _PHASE2_INDEX.items()
+}
+
 
 def get_phase1_screen(index: int) -> dict:
     """Return Phase 1 screen by zero-based index (0–5).
@@ -35,6 +51,23 @@ def get_phase2_template(node: str) -> dict:
     return _PHASE2_INDEX[node]
 
 
-def get_all_phase2_nodes() -> list[str]:
+def get_phase2_screen(node: str) -> dict:
+    """Return the display screen for a Phase 2 node (question + options).
+
+    Raises KeyError if the node is not found.
+    """
+    try:
+        return _PHASE2_SCREENS[node]
+    except KeyError:
+        valid = ", ".join(sorted(_PHASE2_SCREENS))
+        raise KeyError(f"Phase 2 node '{node}' not found. Valid nodes: {valid}") from None
+
+
+def get_all_phase2_nodes() -> tuple[str, ...]:
     """Return all 20 Phase 2 node keys in definition order."""
-    return [t["node"] for t in PHASE2_TEMPLATES]
+    return _PHASE2_NODES
+
+
+def is_phase2_node(node: str) -> bool:
+    """Return True if *node* is a known Phase 2 node key (O(1) index lookup)."""
+    return node in _PHASE2_INDEX
@@ -22,6 +22,8 @@ from app.services.simulator.schemas import (
     SpecialistProfile,
 )
 
+_SIGNAL_EMOJI = {"GREEN": "🟢", "YELLOW": "🟡", "RED": "🔴"}
+
 
 def generate_report_docx(
     report_text: str,
@@ -243,15 +245,13 @@ def _add_signal_table(doc, iteration_log: list[IterationLog]):
         run.bold = True
         run.font.size = Pt(8)
 
-    signal_emoji = {"GREEN": "🟢", "YELLOW": "🟡", "RED": "🔴"}
-
     for r_idx, it in enumerate(iteration_log, 1):
         row = table.rows[r_idx]
         data = [
             str(it.replica_id),
             it.fsm_before,
             it.active_layer_before,
-            signal_emoji.get(it.signal.value, "?"),
+            _SIGNAL_EMOJI.get(it.signal.value, "?"),
             f"{it.regulatory_match_score:.2f}",
             f"{it.cascade_probability:.2f}",
             f"{it.delta.trust:+d}",
@@ -1,7 +1,26 @@
 """System prompt v1.1 — PsycheOS Simulator."""
 
+import functools
+
+from app.services.simulator.cases import BUILTIN_CASES
 from app.services.simulator.schemas import BuiltinCase, SessionGoal, SessionMode, CCIComponents
 
+_CASE_KEY_BY_ID = {case.case_id: key for key, case in BUILTIN_CASES.items()}
+
+
+@functools.lru_cache(maxsize=64)
+def builtin_case_prompt(case_id: str, goal: SessionGoal, mode: SessionMode) -> str:
+    """System prompt for a built-in case, built once per (case, goal, mode).
+
+    Every simulator turn needs the prompt again; built-in cases never change,
+    so the rendered text is reused instead of re-formatted. Unknown case ids
+    fall back to case "1".
+    """
+    case = BUILTIN_CASES.get(
+        _CASE_KEY_BY_ID.get(case_id, "1"), next(iter(BUILTIN_CASES.values()))
+    )
+    return build_system_prompt(case, goal, mode)
+
 
 def build_system_prompt(
     case: BuiltinCase,
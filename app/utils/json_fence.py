@@ -0,0 +1,40 @@
+"""
+Markdown fence stripping for Claude JSON responses.
+
+Claude often wraps JSON in ```json … ``` even when told not to. The body is
+cut out with a single slice (str.find on the closing fence) instead of
+stacking startswith/endswith slices, each of which copies the whole response.
+
+loads_json_response() parses the body with orjson and falls back, for
+replies that wrap the object in prose, to decoding the first {...} with
+JSONDecoder.raw_decode (ignoring whatever follows it).
+"""
+import json
+
+import orjson
+
+_decoder = json.JSONDecoder()
+
+
+def strip_code_fence(text: str) -> str:
+    """Return the body of a leading ``` / ```json fence, or the stripped text."""
+    t = text.strip()
+    if not t.startswith("```"):
+        return t
+    end = t.find("```", 3)
+    body = t[3:end] if end != -1 else t[3:]
+    if body.startswith("json"):
+        body = body[4:]
+    return body.strip()
+
+
+def loads_json_response(text: str):
+    """Parse the JSON object in a Claude reply (fenced, bare, or amid prose)."""
+    body = strip_code_fence(text)
+    try:
+        return orjson.loads(body)
+    except orjson.JSONDecodeError:
+        start = body.find("{")
+        if start == -1:
+            raise
+        return _decoder.raw_decode(body, start)[0]
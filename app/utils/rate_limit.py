@@ -0,0 +1,63 @@
+"""
+Adaptive token bucket for pacing outgoing Telegram Bot API calls.
+
+Telegram allows roughly 30 messages/sec per bot; bursts above that come
+back as 429 RetryAfter. The bucket paces callers proactively and adapts
+its refill rate AIMD-style: additive increase after each success,
+multiplicative decrease (halving) plus a hard pause when throttled.
+"""
+import asyncio
+import time
+
+
+class AdaptiveTokenBucket:
+    """Async token bucket with an AIMD-adjusted refill rate (tokens/sec)."""
+
+    def __init__(
+        self,
+        rate: float,
+        *,
+        min_rate: float = 1.0,
+        increase: float = 0.5,
+    ) -> None:
+        self.max_rate = rate
+        self.min_rate = min_rate
+        self.increase = increase
+        self.rate = rate
+        self._tokens = rate  # allow up to one second of burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available, then take it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(
+                    self.max_rate, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+    def on_success(self) -> None:
+        """Additive increase after a call went through."""
+        self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttled(self, retry_after: float) -> None:
+        """Multiplicative decrease and a pause after a 429 from Telegram."""
+        self.rate = max(self.min_rate, self.rate / 2)
+        self._tokens = 0.0
+        self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+
+def retry_after_seconds(value) -> float:
+    """Normalise RetryAfter.retry_after (int seconds or timedelta) to float seconds."""
+    total_seconds = getattr(value, "total_seconds", None)
+    return float(total_seconds() if total_seconds else value)
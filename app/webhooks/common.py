@@ -6,19 +6,67 @@ Responsibilities:
 2. Deduplicate updates (skip if already processed)
 3. Load / save bot_chat_state from DB
 """
+import asyncio
 import logging
+
 from fastapi import Request, HTTPException
 from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from telegram import Update, Bot
+from telegram.request import HTTPXRequest
 
+from app.config import settings
 from app.models.bot_chat_state import BotChatState
 from app.models.telegram_dedup import TelegramUpdateDedup
 
 logger = logging.getLogger(__name__)
 
 
+# Strong refs for fire-and-forget tasks (the loop only keeps weak ones).
+_background_tasks: set[asyncio.Task] = set()
+
+
+def ack_callback(query) -> None:
+    """Answer a callback query without waiting for Telegram's reply.
+
+    The plain answer only dismisses the button spinner, so the handler can
+    go straight on to its own API calls instead of serializing behind it.
+    Keep `await query.answer(..., show_alert=True)` where the alert matters.
+    """
+    task = asyncio.create_task(query.answer())
+    _background_tasks.add(task)
+    task.add_done_callback(_on_background_done)
+
+
+def _on_background_done(task: asyncio.Task) -> None:
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Background callback answer failed: %r", task.exception())
+
+
+def make_bot(token: str) -> Bot:
+    """Build a Bot whose HTTP client keeps a real connection pool.
+
+    PTB's default HTTPXRequest has a pool of one connection, so concurrent
+    webhook handlers (or worker slots) queue behind each other on every
+    Telegram call. HTTP/2 is opt-in via TG_HTTP2 (multiplexes over one
+    connection; requires h2).
+
+    Webhook replies are not paced here: a handler holds the chat's FSM row
+    lock and a pooled DB connection, so it must never queue on a send
+    budget. Bulk delivery is paced by the worker's outbox dispatcher.
+    """
+    return Bot(
+        token=token,
+        request=HTTPXRequest(
+            connection_pool_size=settings.TG_POOL_SIZE,
+            pool_timeout=settings.TG_POOL_TIMEOUT,
+            http_version="2" if settings.TG_HTTP2 else "1.1",
+        ),
+    )
+
+
 def verify_secret(request: Request, expected_secret: str) -> None:
     """
     Check X-Telegram-Bot-Api-Secret-Token header.
@@ -88,6 +136,11 @@ async def upsert_chat_state(
     """
     Create or update FSM state for (bot, chat).
     Uses INSERT ... ON CONFLICT UPDATE for atomicity.
+
+    The UPDATE branch reads from EXCLUDED rather than re-binding the values,
+    so the JSONB payload is serialized and sent once per upsert, not twice.
+    RETURNING hands back the written row in the same round-trip, refreshing
+    the instance the router already holds instead of re-selecting it.
     """
     payload = state_payload or {}
 
@@ -103,19 +156,19 @@ async def upsert_chat_state(
     stmt = stmt.on_conflict_do_update(
         index_elements=["bot_id", "chat_id"],
         set_={
-            "state": state,
-            "state_payload": payload,
+            "state": stmt.excluded.state,
+            "state_payload": stmt.excluded.state_payload,
             "user_id": user_id or stmt.excluded.user_id,
-            "role": role,
-            "context_id": context_id,
+            "role": stmt.excluded.role,
+            "context_id": stmt.excluded.context_id,
             "updated_at": text("now()"),
         },
     )
-    await db.execute(stmt)
-    await db.flush()
-
-    # Return the current state
-    return await load_chat_state(db, bot_id, chat_id)
+    result = await db.scalars(
+        stmt.returning(BotChatState),
+        execution_options={"populate_existing": True},
+    )
+    return result.one()
 
 
 def extract_chat_id(update: Update) -> int | None:
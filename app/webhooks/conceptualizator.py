@@ -11,6 +11,7 @@ state_payload keys:
   session   — full SessionState serialised as dict (model_dump)
 """
 import logging
+import re
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -21,7 +22,7 @@ from app.models.artifact import Artifact
 from app.models.bot_chat_state import BotChatState
 from app.services.conceptualizer.decision_policy import select_next_question
 from app.services.conceptualizer.models import DataMap, SessionState
-from app.services.conceptualizer.enums import SessionStateEnum
+from app.services.conceptualizer.enums import HypothesisType, SessionStateEnum
 from app.services.job_queue import enqueue, is_job_pending_for_chat
 from app.services.links import LinkVerifyError, verify_link
 from app.webhooks.common import upsert_chat_state
@@ -30,6 +31,8 @@ logger = logging.getLogger(__name__)
 
 BOT_ID = "conceptualizator"
 
+_SERVICE_LABELS = {"screen": "📊 Скрининг", "interpretator": "🧠 Интерпретация"}
+
 
 # ── Session state helpers ──────────────────────────────────────────────────────
 
@@ -74,14 +77,19 @@ def _session_id(chat_id: int, state: BotChatState) -> str:
     return f"cnc_{chat_id}_{short}" if short else f"cnc_{chat_id}"
 
 
+_CLARIFICATION_KEYWORDS = (
+    "что значит", "уточните", "поясните", "не понял",
+    "непонятно", "объясните", "что имеется в виду",
+    "как это", "что это означает",
+)
+# One alternation scanned once, instead of a substring search per keyword.
+_CLARIFICATION_RE = re.compile("|".join(map(re.escape, _CLARIFICATION_KEYWORDS)))
+
+
 def _is_clarification_request(message: str) -> bool:
-    keywords = [
-        "что значит", "уточните", "поясните", "не понял",
-        "непонятно", "объясните", "что имеется в виду",
-        "как это", "что это означает",
-    ]
-    ml = message.lower()
-    return ("?" in message or any(kw in ml for kw in keywords)) and len(message) < 150
+    if len(message) >= 150:
+        return False
+    return "?" in message or _CLARIFICATION_RE.search(message.lower()) is not None
 
 
 # ── Entry point ────────────────────────────────────────────────────────────────
@@ -155,10 +163,9 @@ async def _start_session(
     artifact_lines: list[str] = []
     screen_context: str | None = None
     interpreter_context: str | None = None
-    _service_emoji = {"screen": "📊 Скрининг", "interpretator": "🧠 Интерпретация"}
 
     for svc_id, svc_summary, svc_payload in existing_artifacts:
-        label = _service_emoji.get(svc_id, svc_id)
+        label = _SERVICE_LABELS.get(svc_id, svc_id)
         short = (svc_summary or "").split(".")[0][:60]
         artifact_lines.append(f"• {label}: {short}" if short else f"• {label}")
 
@@ -271,6 +278,13 @@ async def _handle_message(
         )
         return
 
+    # Route before deserialising, so states without a text handler never pay
+    # for validating the full session.
+    handler = _STATE_HANDLERS.get(state.state)
+    if handler is None:
+        await bot.send_message(chat_id=chat_id, text="Для запуска используйте ссылку из Pro.")
+        return
+
     session = _load_session(state)
     if session is None:
         await bot.send_message(
@@ -279,12 +293,7 @@ async def _handle_message(
         )
         return
 
-    if state.state == "data_collection":
-        await _handle_data_collection(bot, db, text, session, state, chat_id, user_id)
-    elif state.state == "socratic_dialogue":
-        await _handle_dialogue(bot, db, text, session, state, chat_id, user_id)
-    else:
-        await bot.send_message(chat_id=chat_id, text="Для запуска используйте ссылку из Pro.")
+    await handler(bot, db, text, session, state, chat_id, user_id)
 
 
 # ── Data collection ────────────────────────────────────────────────────────────
@@ -366,6 +375,13 @@ async def _handle_dialogue(
     await bot.send_message(chat_id=chat_id, text="⏳ Анализирую ответ...")
 
 
+# FSM state → free-text handler
+_STATE_HANDLERS = {
+    "data_collection": _handle_data_collection,
+    "socratic_dialogue": _handle_dialogue,
+}
+
+
 # ── Utility commands ───────────────────────────────────────────────────────────
 
 async def _handle_status(
@@ -383,11 +399,9 @@ async def _handle_status(
         await bot.send_message(chat_id=chat_id, text="Не удалось загрузить сессию.")
         return
 
-    total = len(session.get_active_hypotheses())
-    managerial = len(session.get_managerial_hypotheses())
-    type_counts: dict[str, int] = {}
-    for h in session.get_active_hypotheses():
-        type_counts[h.type.value] = type_counts.get(h.type.value, 0) + 1
+    type_counts = session.get_type_counts()
+    total = sum(type_counts.values())
+    managerial = type_counts.get(HypothesisType.MANAGERIAL, 0)
 
     lines = [
         "📊 <b>Статус сессии</b>\n",
@@ -396,7 +410,7 @@ async def _handle_status(
         f"<b>Гипотезы: {total}</b>",
     ]
     for htype, cnt in type_counts.items():
-        lines.append(f"  • {htype}: {cnt}")
+        lines.append(f"  • {htype.value}: {cnt}")
 
     if session.can_proceed_to_output():
         lines.append("\n✅ Готово к формированию концептуализации!")
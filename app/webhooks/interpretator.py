@@ -19,8 +19,9 @@ The webhook now:
 """
 import base64
 import logging
-from datetime import datetime, timezone
+import time
 
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession
 from telegram import Bot, Update
 
@@ -33,6 +34,19 @@ logger = logging.getLogger(__name__)
 
 BOT_ID = "interpretator"
 
+# Fresh-session FSM payload, serialized once at import. orjson.loads of these
+# bytes yields an independent copy (new lists) faster than rebuilding the
+# literal or deep-copying a template dict.
+_INITIAL_PAYLOAD_JSON = orjson.dumps({
+    "mode": "STANDARD",
+    "iteration_count": 0,
+    "repair_attempts": 0,
+    "material_type": "unknown",
+    "completeness": "unknown",
+    "accumulated_material": [],
+    "clarifications_received": [],
+})
+
 
 # ── Entry point ───────────────────────────────────────────────────────────────
 
@@ -82,21 +96,14 @@ async def _start_session(
         )
         return
 
+    state_payload = orjson.loads(_INITIAL_PAYLOAD_JSON)
+    state_payload["run_id"] = str(token.jti)   # jti = billing key (matches reserve_stars in pro.py)
     await upsert_chat_state(
         db,
         bot_id=BOT_ID,
         chat_id=chat_id,
         state="active",
-        state_payload={
-            "run_id": str(token.jti),   # jti = billing key (matches reserve_stars in pro.py)
-            "mode": "STANDARD",
-            "iteration_count": 0,
-            "repair_attempts": 0,
-            "material_type": "unknown",
-            "completeness": "unknown",
-            "accumulated_material": [],
-            "clarifications_received": [],
-        },
+        state_payload=state_payload,
         user_id=user_id,
         role=token.role,
         context_id=token.context_id,
@@ -155,7 +162,7 @@ async def _handle_text(
 
     payload = dict(state.state_payload or {})
     payload.setdefault("accumulated_material", []).append({
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "ts_ms": int(time.time() * 1000),
         "content": text,
     })
     # When specialist answers a clarifying question in intake/clarification_loop,
@@ -10,20 +10,20 @@ Flows:
 - case_{id} → case view with tool launch buttons
 - launch_{service_id}_{context_id} → issue link token → deep link
 """
-import io
-import json
+import functools
 import logging
 import secrets
 import uuid
 from datetime import datetime, timezone, timedelta
 
+import orjson
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from telegram import Update, Bot, InlineKeyboardButton, InlineKeyboardMarkup, InputFile, LabeledPrice
 
 from app.config import settings
-from app.webhooks.common import upsert_chat_state
+from app.webhooks.common import ack_callback, upsert_chat_state
 from app.models.bot_chat_state import BotChatState
 from app.models.user import User
 from app.models.invite import Invite
@@ -42,6 +42,9 @@ from app.services.billing import (
 
 logger = logging.getLogger(__name__)
 
+# Invite tokens must stay unguessable, so keep the CSPRNG; bind it once.
+_token_hex = secrets.token_hex
+
 
 # ──────────────────── Helpers ────────────────────
 
@@ -53,10 +56,23 @@ def escape_md(text: str) -> str:
 
 
 async def get_user_by_tg(db: AsyncSession, telegram_id: int) -> User | None:
+    """Return the User for *telegram_id*, memoized on the request's session.
+
+    The AsyncSession lives for one webhook update, so db.info is a
+    request-scoped cache. Misses are not cached: register_user() looks the
+    user up again right after inserting.
+    """
+    cache: dict[int, User] = db.info.setdefault("users_by_tg", {})
+    user = cache.get(telegram_id)
+    if user is not None:
+        return user
     result = await db.execute(
         select(User).where(User.telegram_id == telegram_id)
     )
-    return result.scalar_one_or_none()
+    user = result.scalar_one_or_none()
+    if user is not None:
+        cache[telegram_id] = user
+    return user
 
 
 async def register_user(
@@ -98,12 +114,37 @@ async def consume_invite(db: AsyncSession, token: str) -> None:
         await db.flush()
 
 
+async def get_owned_context(
+    db: AsyncSession, context_id: uuid.UUID, telegram_id: int
+) -> tuple[Context | None, User | None]:
+    """Load a case and, in the same query, the requesting specialist if they own it.
+
+    Returns (ctx, user): ctx is None when the case does not exist; user is
+    None unless the specialist with *telegram_id* is the case owner.
+    """
+    result = await db.execute(
+        select(Context, User)
+        .outerjoin(
+            User,
+            (User.user_id == Context.specialist_user_id) & (User.telegram_id == telegram_id),
+        )
+        .where(Context.context_id == context_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None, None
+    return row[0], row[1]
+
+
 def is_admin(telegram_id: int) -> bool:
     return telegram_id in settings.admin_ids
 
 
 # ──────────────────── Keyboards ────────────────────
+# PTB markups are frozen after construction, so the fixed menus are built
+# once and shared; per-case keyboards are memoized by context_id.
 
+@functools.cache
 def main_menu_kb() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup([
         [InlineKeyboardButton("📋 Мои кейсы", callback_data="cases_list")],
@@ -113,6 +154,7 @@ def main_menu_kb() -> InlineKeyboardMarkup:
     ])
 
 
+@functools.cache
 def admin_menu_kb() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup([
         [InlineKeyboardButton("🔗 Создать приглашение", callback_data="adm_invite_new")],
@@ -123,24 +165,43 @@ def admin_menu_kb() -> InlineKeyboardMarkup:
     ])
 
 
+@functools.cache
 def back_to_main_kb() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup([
         [InlineKeyboardButton("◀️ Главное меню", callback_data="main_menu")],
     ])
 
 
+@functools.cache
 def back_to_admin_kb() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup([
         [InlineKeyboardButton("◀️ Админ-панель", callback_data="admin_panel")],
     ])
 
 
+@functools.cache
 def exit_reference_kb() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup([
         [InlineKeyboardButton("◀️ Выйти из справочника", callback_data="exit_reference")],
     ])
 
 
+@functools.cache
+def topup_kb() -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup([
+        [
+            InlineKeyboardButton("⭐ 50 Stars",  callback_data="topup_50"),
+            InlineKeyboardButton("⭐ 100 Stars", callback_data="topup_100"),
+        ],
+        [
+            InlineKeyboardButton("⭐ 200 Stars", callback_data="topup_200"),
+            InlineKeyboardButton("⭐ 500 Stars", callback_data="topup_500"),
+        ],
+        [InlineKeyboardButton("◀️ Главное меню", callback_data="main_menu")],
+    ])
+
+
+@functools.lru_cache(maxsize=512)
 def case_tools_kb(context_id: str) -> InlineKeyboardMarkup:
     """Keyboard for active case view — tool launch buttons, archive/delete, back."""
     return InlineKeyboardMarkup([
@@ -158,6 +219,7 @@ def case_tools_kb(context_id: str) -> InlineKeyboardMarkup:
     ])
 
 
+@functools.lru_cache(maxsize=512)
 def case_tools_archived_kb(context_id: str) -> InlineKeyboardMarkup:
     """Keyboard for archived case view — read-only artifacts, restore, delete."""
     return InlineKeyboardMarkup([
@@ -329,7 +391,7 @@ async def handle_callback(
     state: BotChatState | None, chat_id: int, user_id: int | None,
 ) -> None:
     query = update.callback_query
-    await query.answer()
+    ack_callback(query)
     data = query.data
 
     if data == "main_menu":
@@ -462,14 +524,12 @@ async def handle_callback(
             await query.edit_message_text("Кейс не найден.", reply_markup=back_to_main_kb())
             return
 
-        result = await db.execute(select(Context).where(Context.context_id == context_uuid))
-        ctx = result.scalar_one_or_none()
+        ctx, user = await get_owned_context(db, context_uuid, user_id)
         if not ctx or ctx.deleted_at is not None:
             await query.edit_message_text("Кейс не найден.", reply_markup=back_to_main_kb())
             return
 
-        user = await get_user_by_tg(db, user_id)
-        if not user or ctx.specialist_user_id != user.user_id:
+        if not user:
             await query.edit_message_text("Нет доступа к этому кейсу.", reply_markup=back_to_main_kb())
             return
 
@@ -495,7 +555,7 @@ async def handle_callback(
         return
 
     if data.startswith("launch_"):
-        _, service_id, context_id_str = data.split("_", 2)
+        service_id, _, context_id_str = data[len("launch_"):].partition("_")
         logger.info(f"[pro] callback launch_ matched: data={data}")
         await handle_launch_tool(query, bot, db, chat_id, user_id, service_id, context_id_str)
         return
@@ -555,17 +615,7 @@ async def handle_callback(
                 f"🎭 Симулятор — ~110 ⭐\n\n"
                 f"_Выберите сумму для пополнения:_"
             ),
-            reply_markup=InlineKeyboardMarkup([
-                [
-                    InlineKeyboardButton("⭐ 50 Stars",  callback_data="topup_50"),
-                    InlineKeyboardButton("⭐ 100 Stars", callback_data="topup_100"),
-                ],
-                [
-                    InlineKeyboardButton("⭐ 200 Stars", callback_data="topup_200"),
-                    InlineKeyboardButton("⭐ 500 Stars", callback_data="topup_500"),
-                ],
-                [InlineKeyboardButton("◀️ Главное меню", callback_data="main_menu")],
-            ]),
+            reply_markup=topup_kb(),
             parse_mode="Markdown",
         )
         return
@@ -617,13 +667,18 @@ async def handle_callback(
     if data == "adm_users":
         if not is_admin(user_id):
             return
-        result = await db.execute(select(User).order_by(User.created_at.desc()).limit(30))
-        users = result.scalars().all()
-        count_result = await db.execute(select(func.count(User.user_id)))
-        total = count_result.scalar()
+        # count(*) OVER () returns the full total alongside the first page,
+        # so the list and the header need one round-trip instead of two.
+        result = await db.execute(
+            select(User, func.count().over())
+            .order_by(User.created_at.desc())
+            .limit(30)
+        )
+        rows = result.all()
+        total = rows[0][1] if rows else 0
 
         lines = [f"👥 Пользователи (всего: {total})\n"]
-        for u in users:
+        for u, _ in rows:
             name = escape_md(u.full_name or u.username or str(u.telegram_id))
             date = u.created_at.strftime("%d.%m.%Y")
             lines.append(f"• {name} — {date}")
@@ -793,14 +848,12 @@ async def handle_case_archive(query, db, user_id, context_id_str):
         await query.answer("Ошибка: неверный ID кейса.", show_alert=True)
         return
 
-    result = await db.execute(select(Context).where(Context.context_id == context_id))
-    ctx = result.scalar_one_or_none()
+    ctx, user = await get_owned_context(db, context_id, user_id)
     if not ctx or ctx.deleted_at is not None:
         await query.answer("Кейс не найден.", show_alert=True)
         return
 
-    user = await get_user_by_tg(db, user_id)
-    if not user or ctx.specialist_user_id != user.user_id:
+    if not user:
         await query.answer("Нет доступа к этому кейсу.", show_alert=True)
         return
 
@@ -826,14 +879,12 @@ async def handle_case_restore(query, db, user_id, context_id_str):
         await query.answer("Ошибка: неверный ID кейса.", show_alert=True)
         return
 
-    result = await db.execute(select(Context).where(Context.context_id == context_id))
-    ctx = result.scalar_one_or_none()
+    ctx, user = await get_owned_context(db, context_id, user_id)
     if not ctx or ctx.deleted_at is not None:
         await query.answer("Кейс не найден.", show_alert=True)
         return
 
-    user = await get_user_by_tg(db, user_id)
-    if not user or ctx.specialist_user_id != user.user_id:
+    if not user:
         await query.answer("Нет доступа к этому кейсу.", show_alert=True)
         return
 
@@ -860,14 +911,12 @@ async def show_case_delete_confirm(query, db, user_id, context_id_str):
         await query.answer("Ошибка: неверный ID кейса.", show_alert=True)
         return
 
-    result = await db.execute(select(Context).where(Context.context_id == context_id))
-    ctx = result.scalar_one_or_none()
+    ctx, user = await get_owned_context(db, context_id, user_id)
     if not ctx or ctx.deleted_at is not None:
         await query.answer("Кейс не найден.", show_alert=True)
         return
 
-    user = await get_user_by_tg(db, user_id)
-    if not user or ctx.specialist_user_id != user.user_id:
+    if not user:
         await query.answer("Нет доступа к этому кейсу.", show_alert=True)
         return
 
@@ -890,14 +939,12 @@ async def handle_case_delete_yes(query, db, user_id, context_id_str):
         await query.answer("Ошибка: неверный ID кейса.", show_alert=True)
         return
 
-    result = await db.execute(select(Context).where(Context.context_id == context_id))
-    ctx = result.scalar_one_or_none()
+    ctx, user = await get_owned_context(db, context_id, user_id)
     if not ctx or ctx.deleted_at is not None:
         await query.answer("Кейс не найден.", show_alert=True)
         return
 
-    user = await get_user_by_tg(db, user_id)
-    if not user or ctx.specialist_user_id != user.user_id:
+    if not user:
         await query.answer("Нет доступа к этому кейсу.", show_alert=True)
         return
 
@@ -1024,13 +1071,11 @@ async def handle_screen_link(query, bot, db, chat_id, user_id, context_id_str):
     except ValueError:
         await query.answer("Ошибка: неверный ID кейса.", show_alert=True)
         return
-    result = await db.execute(select(Context).where(Context.context_id == context_id))
-    ctx = result.scalar_one_or_none()
+    ctx, user = await get_owned_context(db, context_id, user_id)
     if not ctx:
         await query.answer("Кейс не найден.", show_alert=True)
         return
-    user = await get_user_by_tg(db, user_id)
-    if not user or ctx.specialist_user_id != user.user_id:
+    if not user:
         await query.answer("Нет доступа к этому кейсу.", show_alert=True)
         return
     token = await issue_link(
@@ -1081,23 +1126,21 @@ async def handle_screen_results(query, bot, db, chat_id, user_id, assessment_id_
         await query.answer("Отчёт ещё не готов. Подождите завершения скрининга.", show_alert=True)
         return
 
-    await query.answer()
-
     date_prefix = assessment.created_at.strftime("%Y%m%d")
     ctx_prefix = str(assessment.context_id)[:8]
     report_json = assessment.report_json
 
-    json_bytes = json.dumps(report_json, ensure_ascii=False, indent=2).encode("utf-8")
+    json_bytes = orjson.dumps(report_json, option=orjson.OPT_INDENT_2)
     await bot.send_document(
         chat_id=chat_id,
-        document=InputFile(io.BytesIO(json_bytes), filename=f"screen_{ctx_prefix}_{date_prefix}.json"),
+        document=InputFile(json_bytes, filename=f"screen_{ctx_prefix}_{date_prefix}.json"),
         caption="📊 Скрининг — структурированные данные (JSON)",
     )
 
     docx_bytes = await generate_report_docx(report_json)
     await bot.send_document(
         chat_id=chat_id,
-        document=InputFile(io.BytesIO(docx_bytes), filename=f"screen_{ctx_prefix}_{date_prefix}.docx"),
+        document=InputFile(docx_bytes, filename=f"screen_{ctx_prefix}_{date_prefix}.docx"),
         caption="📋 Скрининг — структурный профиль (DOCX)",
     )
 
@@ -1123,13 +1166,11 @@ async def handle_launch_tool(query, bot, db, chat_id, user_id, service_id, conte
         await query.answer("Ошибка: неверный ID кейса.", show_alert=True)
         return
 
-    result = await db.execute(select(Context).where(Context.context_id == context_id))
-    ctx = result.scalar_one_or_none()
+    ctx, user = await get_owned_context(db, context_id, user_id)
     if not ctx:
         await query.answer("Кейс не найден.", show_alert=True)
         return
-    user = await get_user_by_tg(db, user_id)
-    if not user or ctx.specialist_user_id != user.user_id:
+    if not user:
         await query.answer("Нет доступа к этому кейсу.", show_alert=True)
         return
 
@@ -1137,14 +1178,15 @@ async def handle_launch_tool(query, bot, db, chat_id, user_id, service_id, conte
     stars_price = await get_stars_price(db, service_id)
     wallet = None
     if stars_price is not None:
-        wallet = await get_or_create_wallet(db, user.user_id, user_id)
+        # Lock the row now so the balance check below and reserve_stars()
+        # share one SELECT FOR UPDATE instead of fetching the wallet twice.
+        wallet = await get_or_create_wallet(db, user.user_id, user_id, for_update=True)
         available = wallet.balance_stars - wallet.reserved_stars
         if available < stars_price:
             shortfall = stars_price - available
             # Suggest top-up: round up to nearest 10, minimum 10 Stars
             top_up = max(10, ((shortfall + 9) // 10) * 10)
             label = _TOOL_LABELS[service_id]
-            await query.answer()
             await bot.send_invoice(
                 chat_id=chat_id,
                 title=f"Запуск «{label}»",
@@ -1174,7 +1216,7 @@ async def handle_launch_tool(query, bot, db, chat_id, user_id, service_id, conte
     if stars_price is not None and wallet is not None:
         await reserve_stars(
             db, wallet, user_id, stars_price,
-            run_id=token.jti, service_id=service_id,
+            run_id=token.jti, service_id=service_id, wallet_locked=True,
         )
 
     deep_link = f"https://t.me/{username}?start={token.jti}"
@@ -1188,11 +1230,10 @@ async def handle_launch_tool(query, bot, db, chat_id, user_id, service_id, conte
         ]),
         parse_mode="Markdown",
     )
-    await query.answer()
 
 
 async def create_invite_with_note(bot, db, chat_id, user_id, note):
-    token = secrets.token_hex(8)
+    token = _token_hex(8)
     invite = Invite(
         token=token, created_by=user_id, max_uses=1, used_count=0,
         note=note.strip()[:255],
@@ -1350,17 +1391,17 @@ async def show_artifact_detail(
         ctx_prefix = context_id_str[:8]
 
         report_json = a.payload.get("report_json", a.payload)
-        json_bytes = json.dumps(report_json, ensure_ascii=False, indent=2).encode("utf-8")
+        json_bytes = orjson.dumps(report_json, option=orjson.OPT_INDENT_2)
         await bot.send_document(
             chat_id=chat_id,
-            document=InputFile(io.BytesIO(json_bytes), filename=f"screen_{ctx_prefix}_{date_prefix}.json"),
+            document=InputFile(json_bytes, filename=f"screen_{ctx_prefix}_{date_prefix}.json"),
             caption="📊 Скрининг — структурированные данные (JSON)",
         )
 
         docx_bytes = await generate_report_docx(report_json)
         await bot.send_document(
             chat_id=chat_id,
-            document=InputFile(io.BytesIO(docx_bytes), filename=f"screen_{ctx_prefix}_{date_prefix}.docx"),
+            document=InputFile(docx_bytes, filename=f"screen_{ctx_prefix}_{date_prefix}.docx"),
             caption="📋 Скрининг — структурный профиль (DOCX)",
         )
         return
@@ -1384,17 +1425,17 @@ async def show_artifact_detail(
             await bot.send_document(
                 chat_id=chat_id,
                 document=InputFile(
-                    io.BytesIO(txt_report.encode("utf-8")),
+                    txt_report.encode("utf-8"),
                     filename=f"interpretation_{ctx_prefix}_{date_prefix}.txt",
                 ),
                 caption="📄 Результаты интерпретации",
             )
         if structured:
-            json_bytes = json.dumps(structured, ensure_ascii=False, indent=2).encode("utf-8")
+            json_bytes = orjson.dumps(structured, option=orjson.OPT_INDENT_2)
             await bot.send_document(
                 chat_id=chat_id,
                 document=InputFile(
-                    io.BytesIO(json_bytes),
+                    json_bytes,
                     filename=f"interpretation_{ctx_prefix}_{date_prefix}.json",
                 ),
                 caption="📋 Структурированные данные (JSON)",
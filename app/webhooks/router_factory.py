@@ -5,6 +5,7 @@ Pipeline for every incoming update:
 1. Verify Telegram secret token → 403 if invalid
 2. Parse Update object
 3. Deduplicate by update_id → skip if already processed
+   (and drop repeat presses of a submit button still being handled)
 4. Load FSM state from DB
 5. Call bot-specific handler
 6. Save FSM state to DB
@@ -13,7 +14,8 @@ Pipeline for every incoming update:
 import logging
 from typing import Callable, Awaitable
 
-from fastapi import APIRouter, Request, Depends
+import orjson
+from fastapi import APIRouter, Request, Depends, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from telegram import Update, Bot
 
@@ -25,10 +27,47 @@ from app.webhooks.common import (
     upsert_chat_state,
     extract_chat_id,
     extract_user_id,
+    make_bot,
+    ack_callback,
 )
 
 logger = logging.getLogger(__name__)
 
+# Every webhook reply is the same body; send pre-encoded bytes instead of
+# running {"ok": True} through FastAPI's encoder on each update.
+_OK_BODY = b'{"ok":true}'
+
+
+def _ok() -> Response:
+    return Response(content=_OK_BODY, media_type="application/json")
+
+
+# Submit-style buttons: each press starts work (a Claude job, an invoice, a
+# link token, a deletion) that must not run twice. Toggles, navigation and
+# pagination are left alone — a quick second tap there is a real input, and
+# the FSM row lock already serializes it.
+_SUBMIT_CALLBACK_PREFIXES = (
+    "confirm_selection",
+    "start_screening",
+    "launch_",
+    "topup_",
+    "screen_link_",
+    "case_delete_yes_",
+    "end:confirm",
+)
+
+
+def _callback_key(update: Update) -> tuple[int, int, str] | None:
+    """(chat_id, message_id, data) of a submit-button press, else None."""
+    query = update.callback_query
+    if query is None or query.message is None:
+        return None
+    data = query.data or ""
+    if not data.startswith(_SUBMIT_CALLBACK_PREFIXES):
+        return None
+    return (query.message.chat.id, query.message.message_id, data)
+
+
 # Type for bot-specific handler function
 BotHandler = Callable[
     [Update, Bot, AsyncSession, "BotChatState | None", int, int | None],
@@ -52,7 +91,11 @@ def create_webhook_router(
         handler: async function(update, bot, db, state, chat_id, user_id) → None
     """
     router = APIRouter()
-    bot = Bot(token=token)
+    bot = make_bot(token)
+    # Submit-button presses being handled right now in this process. A
+    # double-tap would otherwise wait on the FSM row lock (holding a pooled
+    # connection) and then replay against state the first press advanced.
+    inflight_callbacks: set[tuple[int, int, str]] = set()
 
     @router.post(f"/webhook/{bot_id}")
     async def webhook_endpoint(request: Request, db: AsyncSession = Depends(get_db)):
@@ -60,11 +103,11 @@ def create_webhook_router(
         verify_secret(request, webhook_secret)
 
         # 2. Parse update
-        data = await request.json()
+        data = orjson.loads(await request.body())
         update = Update.de_json(data, bot)
 
         if not update:
-            return {"ok": True}
+            return _ok()
 
         # 3. Extract identifiers
         chat_id = extract_chat_id(update)
@@ -72,28 +115,43 @@ def create_webhook_router(
 
         if chat_id is None:
             logger.warning(f"[{bot_id}] No chat_id in update {update.update_id}")
-            return {"ok": True}
+            return _ok()
 
-        # 4. Deduplicate
-        is_dup = await is_duplicate_update(db, bot_id, update.update_id, chat_id)
-        if is_dup:
-            logger.info(f"[{bot_id}] Duplicate update {update.update_id}, skipping")
-            return {"ok": True}
+        # 4. Single-flight repeated presses of the same submit button
+        flight_key = _callback_key(update)
+        if flight_key is not None:
+            if flight_key in inflight_callbacks:
+                logger.info(f"[{bot_id}] Repeat press in flight, dropping update {update.update_id}")
+                ack_callback(update.callback_query)
+                return _ok()
+            inflight_callbacks.add(flight_key)
 
-        # 5. Load FSM state (with row-level lock to prevent concurrent state mutation)
-        state = await load_chat_state(db, bot_id, chat_id, for_update=True)
-
-        # 6. Call bot-specific handler
         try:
-            await handler(update, bot, db, state, chat_id, user_id)
-        except Exception as e:
-            logger.exception(f"[{bot_id}] Error handling update {update.update_id}: {e}")
-            # Still return 200 to Telegram — we don't want retries for app errors
-            # Error is logged to Sentry
-
-        # 7. Commit transaction
-        await db.commit()
-
-        return {"ok": True}
+            # 5. Deduplicate
+            is_dup = await is_duplicate_update(db, bot_id, update.update_id, chat_id)
+            if is_dup:
+                logger.info(f"[{bot_id}] Duplicate update {update.update_id}, skipping")
+                return _ok()
+
+            # 6. Load FSM state (with row-level lock to prevent concurrent state mutation)
+            state = await load_chat_state(db, bot_id, chat_id, for_update=True)
+
+            # 7. Call bot-specific handler
+            try:
+                await handler(update, bot, db, state, chat_id, user_id)
+            except Exception:
+                # logger.exception renders the exception and traceback itself,
+                # and only when the record is emitted.
+                logger.exception("[%s] Error handling update %s", bot_id, update.update_id)
+                # Still return 200 to Telegram — we don't want retries for app errors
+                # Error is logged to Sentry
+
+            # 8. Commit transaction
+            await db.commit()
+        finally:
+            if flight_key is not None:
+                inflight_callbacks.discard(flight_key)
+
+        return _ok()
 
     return router
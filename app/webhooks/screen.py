@@ -10,6 +10,7 @@ FSM states:
 """
 from __future__ import annotations
 
+import functools
 import logging
 from uuid import UUID
 
@@ -21,8 +22,9 @@ from app.models.bot_chat_state import BotChatState
 from app.models.screening_assessment import ScreeningAssessment
 from app.services.job_queue import enqueue, is_job_pending_for_chat
 from app.services.links import LinkVerifyError, verify_link
+from app.services.screen import screen_bank
 from app.services.screen.orchestrator import ScreenOrchestrator
-from app.webhooks.common import upsert_chat_state
+from app.webhooks.common import ack_callback, upsert_chat_state
 
 logger = logging.getLogger(__name__)
 
@@ -98,6 +100,21 @@ async def _handle_message(
 # /start token verification
 # ---------------------------------------------------------------------------
 
+_WELCOME_TEXT = (
+    "👋 Добро пожаловать в PsycheOS Screen!\n\n"
+    "Этот короткий скрининг поможет вашему специалисту лучше понять "
+    "ваше текущее состояние.\n\n"
+    "📋 Вас ждут несколько вопросов с вариантами ответа.\n"
+    "Вы можете выбирать несколько вариантов одновременно.\n\n"
+    "Нажмите «Начать», когда будете готовы."
+)
+
+# PTB markup objects are immutable, so one instance serves every /start.
+_START_SCREENING_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("▶️ Начать скрининг", callback_data="start_screening")],
+])
+
+
 async def _handle_start_token(
     bot: Bot,
     db: AsyncSession,
@@ -160,17 +177,8 @@ async def _handle_start_token(
 
     await bot.send_message(
         chat_id=chat_id,
-        text=(
-            "👋 Добро пожаловать в PsycheOS Screen!\n\n"
-            "Этот короткий скрининг поможет вашему специалисту лучше понять "
-            "ваше текущее состояние.\n\n"
-            "📋 Вас ждут несколько вопросов с вариантами ответа.\n"
-            "Вы можете выбирать несколько вариантов одновременно.\n\n"
-            "Нажмите «Начать», когда будете готовы."
-        ),
-        reply_markup=InlineKeyboardMarkup([
-            [InlineKeyboardButton("▶️ Начать скрининг", callback_data="start_screening")],
-        ]),
+        text=_WELCOME_TEXT,
+        reply_markup=_START_SCREENING_MARKUP,
     )
 
 
@@ -187,123 +195,183 @@ async def _handle_callback(
     user_id: int | None,
 ) -> None:
     query = update.callback_query
-    await query.answer()
-    data = query.data
-
+    ack_callback(query)
+    data = query.data or ""
+
+    # One rpartition + dict lookup instead of a chain of ==/startswith tests:
+    # "toggle_3" routes to "toggle" with arg "3"; fixed names route as-is.
+    kind, _, arg = data.rpartition("_")
+    if not arg.isdigit():
+        kind, arg = data, ""
+    route = _CALLBACK_ROUTES.get(kind)
+    if route is None:
+        return
+    allowed_states, handler = route
     current_state = state.state if state else None
-    payload = (state.state_payload or {}) if state else {}
+    if current_state not in allowed_states:
+        return
+    await handler(query, bot, db, state, chat_id, user_id, arg)
 
-    # ── start_screening ──────────────────────────────────────────────────
-    if data == "start_screening" and current_state == "active":
-        assessment_id_str = payload.get("assessment_id")
-        if not assessment_id_str:
-            await bot.send_message(
-                chat_id=chat_id,
-                text="❌ Ошибка сессии. Используйте ссылку от специалиста.",
-            )
-            return
 
-        orchestrator = ScreenOrchestrator(db)
-        result = await orchestrator.start_assessment(UUID(assessment_id_str))
-
-        if result["action"] == "show_screen":
-            new_payload = dict(payload)
-            new_payload["current_screen"] = result["screen"]
-            new_payload["screen_index"] = result.get("screen_index", 0)
-            new_payload["selected_options"] = []
-            new_payload["phase"] = result["phase"]
-            await upsert_chat_state(
-                db, "screen", chat_id, "phase1",
-                state_payload=new_payload, user_id=user_id, role="client",
-                context_id=state.context_id if state else None,
-            )
-            screen_index = result.get("screen_index", 0)
-            header = f"📋 Вопрос {screen_index + 1} из 6" if result["phase"] == 1 else None
-            await _show_multi_select(bot, chat_id, result["screen"], [], header=header)
-        elif result["action"] == "complete":
-            await _handle_completion(bot, db, chat_id, user_id, state)
+async def _cb_start_screening(
+    query, bot: Bot, db: AsyncSession, state: BotChatState,
+    chat_id: int, user_id: int | None, arg: str,
+) -> None:
+    payload = state.state_payload or {}
+    assessment_id_str = payload.get("assessment_id")
+    if not assessment_id_str:
+        await bot.send_message(
+            chat_id=chat_id,
+            text="❌ Ошибка сессии. Используйте ссылку от специалиста.",
+        )
         return
 
-    # ── toggle_{idx} ─────────────────────────────────────────────────────
-    if data.startswith("toggle_") and current_state in ("phase1", "phase2", "phase3"):
-        try:
-            idx = int(data[len("toggle_"):])
-        except ValueError:
-            return
-
-        selected = list(payload.get("selected_options", []))
-        if idx in selected:
-            selected.remove(idx)
-        else:
-            selected.append(idx)
+    orchestrator = ScreenOrchestrator(db)
+    result = await orchestrator.start_assessment(UUID(assessment_id_str))
 
+    if result["action"] == "show_screen":
         new_payload = dict(payload)
-        new_payload["selected_options"] = selected
+        _set_current_screen(new_payload, result["phase"], result["screen"])
+        new_payload["screen_index"] = result.get("screen_index", 0)
+        new_payload["selected_options"] = []
+        new_payload["phase"] = result["phase"]
         await upsert_chat_state(
-            db, "screen", chat_id, current_state,
+            db, "screen", chat_id, "phase1",
             state_payload=new_payload, user_id=user_id, role="client",
-            context_id=state.context_id if state else None,
+            context_id=state.context_id,
         )
-        await _update_multi_select(query, payload.get("current_screen", {}), selected)
+        screen_index = result.get("screen_index", 0)
+        header = f"📋 Вопрос {screen_index + 1} из 6" if result["phase"] == 1 else None
+        await _show_multi_select(bot, chat_id, result["screen"], [], header=header)
+    elif result["action"] == "complete":
+        await _handle_completion(bot, db, chat_id, user_id, state)
+
+
+async def _cb_toggle(
+    query, bot: Bot, db: AsyncSession, state: BotChatState,
+    chat_id: int, user_id: int | None, arg: str,
+) -> None:
+    current_state = state.state
+    payload = state.state_payload or {}
+    idx = int(arg)
+
+    selected = list(payload.get("selected_options", []))
+    if idx in selected:
+        selected.remove(idx)
+    else:
+        selected.append(idx)
+
+    new_payload = dict(payload)
+    new_payload["selected_options"] = selected
+    await upsert_chat_state(
+        db, "screen", chat_id, current_state,
+        state_payload=new_payload, user_id=user_id, role="client",
+        context_id=state.context_id,
+    )
+    await _update_multi_select(query, _current_screen(payload), selected)
+
+
+async def _cb_confirm_selection(
+    query, bot: Bot, db: AsyncSession, state: BotChatState,
+    chat_id: int, user_id: int | None, arg: str,
+) -> None:
+    current_state = state.state
+    payload = state.state_payload or {}
+    selected = payload.get("selected_options", [])
+    if not selected:
+        await query.answer("Выберите хотя бы один вариант.", show_alert=True)
         return
 
-    # ── confirm_selection ────────────────────────────────────────────────
-    if data == "confirm_selection" and current_state in ("phase1", "phase2", "phase3"):
-        selected = payload.get("selected_options", [])
-        if not selected:
-            await query.answer("Выберите хотя бы один вариант.", show_alert=True)
-            return
+    assessment_id_str = payload.get("assessment_id")
+    if not assessment_id_str:
+        await bot.send_message(chat_id=chat_id, text="❌ Ошибка сессии.")
+        return
 
-        assessment_id_str = payload.get("assessment_id")
-        if not assessment_id_str:
-            await bot.send_message(chat_id=chat_id, text="❌ Ошибка сессии.")
-            return
+    # Remove keyboard immediately so the user sees feedback, then show typing
+    await query.edit_message_reply_markup(reply_markup=None)
+    await bot.send_chat_action(chat_id=chat_id, action="typing")
 
-        # Remove keyboard immediately so the user sees feedback, then show typing
-        await query.edit_message_reply_markup(reply_markup=None)
-        await bot.send_chat_action(chat_id=chat_id, action="typing")
+    orchestrator = ScreenOrchestrator(db)
+    assessment_id = UUID(assessment_id_str)
+    current_screen = _current_screen(payload)
 
-        orchestrator = ScreenOrchestrator(db)
-        assessment_id = UUID(assessment_id_str)
-        current_screen = payload.get("current_screen", {})
+    if current_state == "phase1":
+        result = await orchestrator.process_phase1_response(
+            assessment_id,
+            payload.get("screen_index", 0),
+            selected,
+        )
+    elif current_state == "phase2":
+        result = await orchestrator.process_phase2_response(
+            assessment_id, selected, current_screen
+        )
+    else:  # phase3
+        result = await orchestrator.process_phase3_response(
+            assessment_id, selected, current_screen
+        )
 
-        if current_state == "phase1":
-            result = await orchestrator.process_phase1_response(
-                assessment_id,
-                payload.get("screen_index", 0),
-                selected,
-            )
-        elif current_state == "phase2":
-            result = await orchestrator.process_phase2_response(
-                assessment_id, selected, current_screen
-            )
-        else:  # phase3
-            result = await orchestrator.process_phase3_response(
-                assessment_id, selected, current_screen
-            )
+    if result["action"] == "show_screen":
+        next_phase = result.get("phase", int(current_state[-1]))
+        next_state = f"phase{next_phase}"
+        new_payload = dict(payload)
+        _set_current_screen(new_payload, next_phase, result["screen"])
+        new_payload["screen_index"] = result.get("screen_index", 0)
+        new_payload["selected_options"] = []
+        new_payload["phase"] = next_phase
+        await upsert_chat_state(
+            db, "screen", chat_id, next_state,
+            state_payload=new_payload, user_id=user_id, role="client",
+            context_id=state.context_id,
+        )
+        # Entering a new phase: the transition note heads the first question
+        # of that phase, so the client gets one message instead of two.
+        if next_phase == 1:
+            header = f"📋 Вопрос {result.get('screen_index', 0) + 1} из 6"
+        else:
+            header = _PHASE_TRANSITION_TEXTS.get((current_state, next_state))
+        await _show_multi_select(bot, chat_id, result["screen"], [], header=header)
+    elif result["action"] == "complete":
+        await _handle_completion(bot, db, chat_id, user_id, state)
 
-        if result["action"] == "show_screen":
-            next_phase = result.get("phase", int(current_state[-1]))
-            next_state = f"phase{next_phase}"
-            new_payload = dict(payload)
-            new_payload["current_screen"] = result["screen"]
-            new_payload["screen_index"] = result.get("screen_index", 0)
-            new_payload["selected_options"] = []
-            new_payload["phase"] = next_phase
-            await upsert_chat_state(
-                db, "screen", chat_id, next_state,
-                state_payload=new_payload, user_id=user_id, role="client",
-                context_id=state.context_id if state else None,
-            )
-            # Notify client when entering a new phase
-            if next_state != current_state:
-                await _show_phase_transition(bot, chat_id, current_state, next_state)
-            screen_idx = result.get("screen_index", 0)
-            ph1_header = f"📋 Вопрос {screen_idx + 1} из 6" if next_phase == 1 else None
-            await _show_multi_select(bot, chat_id, result["screen"], [], header=ph1_header)
-        elif result["action"] == "complete":
-            await _handle_completion(bot, db, chat_id, user_id, state)
-        return
+
+_ANSWER_STATES = frozenset({"phase1", "phase2", "phase3"})
+
+# callback kind → (FSM states it is valid in, handler)
+_CALLBACK_ROUTES = {
+    "start_screening": (frozenset({"active"}), _cb_start_screening),
+    "toggle": (_ANSWER_STATES, _cb_toggle),
+    "confirm_selection": (_ANSWER_STATES, _cb_confirm_selection),
+}
+
+
+# ---------------------------------------------------------------------------
+# Current-screen reference
+# ---------------------------------------------------------------------------
+
+def _set_current_screen(payload: dict, phase: int, screen: dict) -> None:
+    """Record the screen on display in the FSM payload.
+
+    Phase 1 (by screen_index) and Phase 2 (by node) screens come straight from
+    the bank, so only a reference is kept; the full dict is stored only for
+    Claude-built Phase 3 screens. Keeps every toggle's payload rewrite small.
+    """
+    if phase == 3:
+        payload["current_screen"] = screen
+        payload.pop("current_node", None)
+    else:
+        payload.pop("current_screen", None)
+        payload["current_node"] = screen.get("node")
+
+
+def _current_screen(payload: dict) -> dict:
+    """Resolve the screen on display from the payload written by _set_current_screen."""
+    screen = payload.get("current_screen")
+    if screen is not None:
+        return screen  # Phase 3, or a session started before references were used
+    if payload.get("phase", 1) == 1:
+        return screen_bank.get_phase1_screen(payload.get("screen_index", 0))
+    node = payload.get("current_node")
+    return screen_bank.get_phase2_screen(node) if node else {}
 
 
 # ---------------------------------------------------------------------------
@@ -323,15 +391,6 @@ _PHASE_TRANSITION_TEXTS: dict[tuple[str, str], str] = {
 }
 
 
-async def _show_phase_transition(
-    bot: Bot, chat_id: int, from_state: str, to_state: str
-) -> None:
-    """Send a brief transition message when moving between phases."""
-    text = _PHASE_TRANSITION_TEXTS.get((from_state, to_state))
-    if text:
-        await bot.send_message(chat_id=chat_id, text=text)
-
-
 async def _show_multi_select(
     bot: Bot, chat_id: int, screen: dict, selected: list[int], header: str | None = None
 ) -> None:
@@ -349,34 +408,44 @@ async def _show_multi_select(
         )
         return
 
-    buttons = []
-    for i, opt in enumerate(options):
-        mark = "✅" if i in selected else "⬜"
-        buttons.append(
-            [InlineKeyboardButton(f"{mark} {opt['text']}", callback_data=f"toggle_{i}")]
-        )
-    buttons.append([InlineKeyboardButton("Подтвердить ✓", callback_data="confirm_selection")])
-
     await bot.send_message(
         chat_id=chat_id,
         text=question,
-        reply_markup=InlineKeyboardMarkup(buttons),
+        reply_markup=_multi_select_markup(options, selected),
     )
 
 
 async def _update_multi_select(query, screen: dict, selected: list[int]) -> None:
     """Edit the keyboard of an existing multi-select message to reflect toggle state."""
     options = screen.get("options", [])
+    await query.edit_message_reply_markup(
+        reply_markup=_multi_select_markup(options, selected)
+    )
+
+
+_CONFIRM_ROW = (InlineKeyboardButton("Подтвердить ✓", callback_data="confirm_selection"),)
+
+
+@functools.lru_cache(maxsize=1024)
+def _option_rows(index: int, text: str) -> tuple[tuple, tuple]:
+    """(unchecked, checked) keyboard rows for one option.
+
+    Option texts repeat across users (bank screens), and PTB buttons are
+    frozen, so each toggle re-render reuses prebuilt rows instead of
+    formatting labels and callback data for every option again.
+    """
+    data = f"toggle_{index}"
+    return (
+        (InlineKeyboardButton(f"⬜ {text}", callback_data=data),),
+        (InlineKeyboardButton(f"✅ {text}", callback_data=data),),
+    )
 
-    buttons = []
-    for i, opt in enumerate(options):
-        mark = "✅" if i in selected else "⬜"
-        buttons.append(
-            [InlineKeyboardButton(f"{mark} {opt['text']}", callback_data=f"toggle_{i}")]
-        )
-    buttons.append([InlineKeyboardButton("Подтвердить ✓", callback_data="confirm_selection")])
 
-    await query.edit_message_reply_markup(reply_markup=InlineKeyboardMarkup(buttons))
+def _multi_select_markup(options: list[dict], selected: list[int]) -> InlineKeyboardMarkup:
+    chosen = set(selected)
+    rows = [_option_rows(i, opt["text"])[i in chosen] for i, opt in enumerate(options)]
+    rows.append(_CONFIRM_ROW)
+    return InlineKeyboardMarkup(rows)
 
 
 # ---------------------------------------------------------------------------
@@ -392,7 +461,7 @@ async def _handle_completion(
 ) -> None:
     """Set FSM to completed and enqueue screen_report job (3 Claude calls in worker)."""
     payload = (state.state_payload or {}) if state else {}
-    new_payload = {k: v for k, v in payload.items() if k not in ("current_screen", "selected_options")}
+    new_payload = {k: v for k, v in payload.items() if k not in ("current_screen", "current_node", "selected_options")}
 
     await upsert_chat_state(
         db, "screen", chat_id, "completed",
@@ -18,7 +18,7 @@ state_payload keys:
   profile         — SpecialistProfile.model_dump(mode="json") | null
 """
 
-import io
+import functools
 import logging
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -34,8 +34,8 @@ from app.services.simulator.goals import GOAL_LABELS, MODE_LABELS
 from app.services.simulator.schemas import (
     CrisisFlag, SessionData, SessionGoal, SessionMode,
 )
-from app.services.simulator.system_prompt import build_system_prompt
-from app.webhooks.common import upsert_chat_state
+from app.services.simulator.system_prompt import builtin_case_prompt
+from app.webhooks.common import ack_callback, upsert_chat_state
 
 logger = logging.getLogger(__name__)
 
@@ -43,7 +43,13 @@ BOT_ID = "simulator"
 
 
 # ── Keyboards ─────────────────────────────────────────────────────────────────
+# Every keyboard here is static (built-in cases, goal labels), so each is built
+# once and reused; PTB markup objects are immutable and safe to share.
 
+_CRISIS_ICON = {"NONE": "⚪", "MODERATE": "🟡", "HIGH": "🔴"}
+
+
+@functools.cache
 def _mode_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup([
         [InlineKeyboardButton("🎓 Обучение — готовые кейсы", callback_data="mode:TRAINING")],
@@ -51,16 +57,17 @@ def _mode_keyboard() -> InlineKeyboardMarkup:
     ])
 
 
+@functools.cache
 def _case_keyboard() -> InlineKeyboardMarkup:
-    crisis_icon = {"NONE": "⚪", "MODERATE": "🟡", "HIGH": "🔴"}
     buttons = []
     for key, case in BUILTIN_CASES.items():
-        icon = crisis_icon.get(case.crisis_flag.value, "")
+        icon = _CRISIS_ICON.get(case.crisis_flag.value, "")
         label = f"{key}. {case.case_name} {icon} CCI:{case.cci.cci:.2f}"
         buttons.append([InlineKeyboardButton(label, callback_data=f"case:{key}")])
     return InlineKeyboardMarkup(buttons)
 
 
+@functools.cache
 def _goal_keyboard() -> InlineKeyboardMarkup:
     buttons = []
     for goal, label in GOAL_LABELS.items():
@@ -68,6 +75,7 @@ def _goal_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(buttons)
 
 
+@functools.cache
 def _crisis_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup([
         [InlineKeyboardButton("⚪ Нет кризиса", callback_data="crisis:NONE")],
@@ -76,6 +84,7 @@ def _crisis_keyboard() -> InlineKeyboardMarkup:
     ])
 
 
+@functools.cache
 def _confirm_end_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup([
         [
@@ -94,7 +103,7 @@ async def handle_simulator(
     # Callback queries (button presses)
     if update.callback_query:
         cq = update.callback_query
-        await cq.answer()
+        ack_callback(cq)
         await _handle_callback(cq, bot, db, state, chat_id, user_id)
         return
 
@@ -177,30 +186,30 @@ async def _handle_callback(
     payload = dict(state.state_payload or {})
     setup_step = payload.get("setup_step")
 
-    if data.startswith("mode:"):
+    # "kind:value" — one partition instead of a startswith + split per branch.
+    # value is cut at the next ":" to match the former split(":")[1].
+    kind, _, value = data.partition(":")
+    value = value.partition(":")[0]
+
+    if kind == "mode":
         await _on_mode_selected(
-            cq.message, bot, db, state, chat_id, user_id,
-            data.split(":")[1], payload,
+            cq.message, bot, db, state, chat_id, user_id, value, payload,
         )
-    elif data.startswith("case:"):
+    elif kind == "case":
         await _on_case_selected(
-            cq.message, bot, db, state, chat_id, user_id,
-            data.split(":")[1], payload,
+            cq.message, bot, db, state, chat_id, user_id, value, payload,
         )
-    elif data.startswith("goal:") and setup_step == "goal":
+    elif kind == "goal" and setup_step == "goal":
         await _on_goal_selected_training(
-            cq.message, bot, db, state, chat_id, user_id,
-            data.split(":")[1], payload,
+            cq.message, bot, db, state, chat_id, user_id, value, payload,
         )
-    elif data.startswith("goal:") and setup_step == "goal_practice":
+    elif kind == "goal" and setup_step == "goal_practice":
         await _on_goal_selected_practice(
-            cq.message, bot, db, state, chat_id, user_id,
-            data.split(":")[1], payload,
+            cq.message, bot, db, state, chat_id, user_id, value, payload,
         )
-    elif data.startswith("crisis:"):
+    elif kind == "crisis":
         await _on_crisis_selected(
-            cq.message, bot, db, state, chat_id, user_id,
-            data.split(":")[1], payload,
+            cq.message, bot, db, state, chat_id, user_id, value, payload,
         )
     elif data == "end:confirm" and state.state == "active":
         await _on_end_confirm(cq.message, bot, db, state, chat_id, user_id, payload)
@@ -303,7 +312,6 @@ async def _on_case_selected(
         await bot.send_message(chat_id=chat_id, text="❌ Кейс не найден.")
         return
 
-    crisis_icon = {"NONE": "⚪", "MODERATE": "🟡", "HIGH": "🔴"}
     payload = {**payload, "case_key": case_key, "setup_step": "goal"}
     await upsert_chat_state(
         db, bot_id=BOT_ID, chat_id=chat_id, state="setup",
@@ -313,7 +321,7 @@ async def _on_case_selected(
     await msg.edit_text(
         f"📋 <b>{case.case_name}</b>\n"
         f"👤 {case.client.gender}, {case.client.age} лет\n"
-        f"⚠️ Кризис: {crisis_icon.get(case.crisis_flag.value, '')} {case.crisis_flag.value}\n"
+        f"⚠️ Кризис: {_CRISIS_ICON.get(case.crisis_flag.value, '')} {case.crisis_flag.value}\n"
         f"📊 Сложность: {case.difficulty}\n\n"
         "Выберите цель сессии:",
         parse_mode="HTML",
@@ -359,10 +367,8 @@ async def _handle_upload_document(
 ) -> None:
     try:
         file = await bot.get_file(msg.document.file_id)
-        buf = io.BytesIO()
-        await file.download_to_memory(buf)
-        buf.seek(0)
-        content = buf.read().decode("utf-8", errors="replace")
+        raw = await file.download_as_bytearray()
+        content = raw.decode("utf-8", errors="replace")
     except Exception as e:
         await bot.send_message(
             chat_id=chat_id,
@@ -631,9 +637,6 @@ def _get_system_prompt(payload: dict, session_data: SessionData) -> str:
     custom = payload.get("custom_prompt")
     if custom:
         return custom
-    case_map = {v.case_id: k for k, v in BUILTIN_CASES.items()}
-    case_key = case_map.get(session_data.case_id, "1")
-    case = BUILTIN_CASES.get(case_key, list(BUILTIN_CASES.values())[0])
-    return build_system_prompt(case, session_data.session_goal, session_data.mode)
+    return builtin_case_prompt(session_data.case_id, session_data.session_goal, session_data.mode)
 
 
@@ -31,9 +31,11 @@ from telegram import Bot
 from app.config import settings
 from app.database import async_session
 from app.models.job import Job as JobModel
+from app.services.anthropic_client import close_anthropic_client
 from app.services.billing import commit_by_run_id, cancel_by_run_id, TERMINAL_JOB_TYPES
 from app.services.job_queue import claim_next, mark_done, mark_failed
 from app.services.outbox import dispatch_one, enqueue_message
+from app.webhooks.common import make_bot
 from app.worker.handlers import REGISTRY
 
 logger = logging.getLogger(__name__)
@@ -181,6 +183,8 @@ async def _mark_job_failed(
                         )
 
                 # ── Admin notification on permanent failure ───────────────
+                # Goes through the outbox like the user notice, so a slow or
+                # throttled Telegram API never holds this transaction open.
                 if (
                     job_row.status == "failed"
                     and settings.ADMIN_CHAT_ID
@@ -188,14 +192,17 @@ async def _mark_job_failed(
                     and "pro" in bots
                 ):
                     try:
-                        await bots["pro"].send_message(
-                            chat_id=settings.ADMIN_CHAT_ID,
-                            text=(
-                                f"⚠️ Job failed permanently:\n"
-                                f"type={job_row.job_type}\n"
-                                f"user={job_row.chat_id}\n"
-                                f"error: {error[:200]}"
-                            ),
+                        await enqueue_message(
+                            db, "pro", settings.ADMIN_CHAT_ID, "send_message",
+                            {
+                                "chat_id": settings.ADMIN_CHAT_ID,
+                                "text": (
+                                    f"⚠️ Job failed permanently:\n"
+                                    f"type={job_row.job_type}\n"
+                                    f"user={job_row.chat_id}\n"
+                                    f"error: {error[:200]}"
+                                ),
+                            },
                         )
                     except Exception:
                         logger.exception(
@@ -327,6 +334,7 @@ async def _run(bots: dict[str, Bot]) -> None:
             logger.exception("[worker] unhandled error in event loop — continuing")
             await asyncio.sleep(JOB_POLL_INTERVAL)
 
+    await close_anthropic_client()
     logger.info("[worker] shutdown complete")
 
 
@@ -352,9 +360,21 @@ def _setup_sentry() -> None:
         logger.warning("[worker] sentry_sdk not installed — Sentry disabled")
 
 
+def _install_uvloop() -> None:
+    # uvloop ships with uvicorn[standard]; the web process already picks it up
+    # via uvicorn's --loop auto, so the worker opts in the same way.
+    try:
+        import uvloop  # type: ignore
+    except ImportError:
+        logger.info("[worker] uvloop not installed — using default asyncio loop")
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("[worker] uvloop event loop enabled")
+
+
 def _build_bots() -> dict[str, Bot]:
     return {
-        bot_id: Bot(token=token)
+        bot_id: make_bot(token)
         for bot_id, (token, _secret) in settings.bot_config.items()
     }
 
@@ -366,6 +386,7 @@ def main() -> None:
     signal.signal(signal.SIGTERM, _handle_signal)
     signal.signal(signal.SIGINT, _handle_signal)
 
+    _install_uvloop()
     bots = _build_bots()
     asyncio.run(_run(bots))
 
@@ -13,16 +13,16 @@ job.payload keys:
 concept_hypothesis additionally:
   message_text  str  — the specialist's message to extract hypothesis from
 """
-import json
+import asyncio
 import logging
 from datetime import datetime, timezone
 
-from anthropic import AsyncAnthropic
 from sqlalchemy.ext.asyncio import AsyncSession
 from telegram import Bot
 
-from app.config import settings
+from app.utils.json_fence import loads_json_response
 from app.models.job import Job
+from app.services.anthropic_client import get_anthropic_client
 from app.services.artifacts import save_artifact
 from app.services.conceptualizer.analysis import extract_hypothesis_from_response
 from app.services.conceptualizer.decision_policy import (
@@ -47,6 +47,11 @@ logger = logging.getLogger(__name__)
 BOT_ID = "conceptualizator"
 _ANTHROPIC_MODEL = "claude-sonnet-4-5-20250929"
 
+_OUTPUT_CAPTION = (
+    "📋 Концептуализация готова\n\n"
+    "Результат также доступен в Истории результатов в боте @PsycheOS_Pro"
+)
+
 _PRE_HYPOTHESES_PROMPT = """\
 Ты - эксперт по психотерапевтической концептуализации в рамках PsycheOS framework.
 
@@ -128,14 +133,7 @@ _SOCRATIC_QUESTION_PROMPT = """\
 
 
 def _parse_json(text: str) -> dict:
-    t = text.strip()
-    if t.startswith("```json"):
-        t = t[7:]
-    if t.startswith("```"):
-        t = t[3:]
-    if t.endswith("```"):
-        t = t[:-3]
-    return json.loads(t.strip())
+    return loads_json_response(text)
 
 
 async def _generate_socratic_question(
@@ -153,7 +151,7 @@ async def _generate_socratic_question(
         f"Описание случая (что рассказал специалист):\n{specialist_observations[:800]}"
     )
     try:
-        client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+        client = get_anthropic_client()
         resp = await client.messages.create(
             model=_ANTHROPIC_MODEL,
             max_tokens=200,
@@ -208,7 +206,7 @@ async def handle_concept_pre_hypotheses(
     user_message = "\n\n".join(context_parts) + "\n\nСгенерируй предварительные гипотезы."
 
     try:
-        client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+        client = get_anthropic_client()
         resp = await client.messages.create(
             model=_ANTHROPIC_MODEL,
             max_tokens=2000,
@@ -368,29 +366,18 @@ async def handle_concept_output(
     session.transition_to(SessionStateEnum.COMPLETE)
     await _persist_session(db, session, "complete", job)
 
-    # Notification
-    await enqueue_message(
-        db, BOT_ID, job.chat_id, "send_message",
-        {"chat_id": job.chat_id, "text": "📋 Концептуализация готова"},
-        job_id=job.job_id, seq=0,
-    )
-
     # DOCX report
     date_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    docx_buf = generate_concept_docx(output, meta={"date": date_str})
+    docx_buf = await asyncio.to_thread(generate_concept_docx, output, meta={"date": date_str})
     context_short = str(job.context_id)[:8] if job.context_id else output.session_id[:8]
     filename = f"concept_{context_short}_{date_str.replace('-', '')}.docx"
-    await enqueue_message(
-        db, BOT_ID, job.chat_id, "send_document",
-        make_document_payload(job.chat_id, docx_buf.read(), filename, "📋 Концептуализация случая"),
-        job_id=job.job_id, seq=1,
-    )
 
-    # History hint
+    # Readiness note and history hint ride in the document caption, so the
+    # whole result is one Bot API call (captions allow up to 1024 chars).
     await enqueue_message(
-        db, BOT_ID, job.chat_id, "send_message",
-        {"chat_id": job.chat_id, "text": "Результат также доступен в Истории результатов в боте @PsycheOS_Pro"},
-        job_id=job.job_id, seq=2,
+        db, BOT_ID, job.chat_id, "send_document",
+        make_document_payload(job.chat_id, docx_buf.read(), filename, _OUTPUT_CAPTION),
+        job_id=job.job_id, seq=0,
     )
 
     # Save artifact
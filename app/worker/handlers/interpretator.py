@@ -17,17 +17,17 @@ interp_photo additionally:
 interp_run additionally:
   run_mode   str  — "STANDARD" | "LOW_DATA" (retry in simplified mode)
 """
-import json
 import logging
+import time
 import uuid
 from datetime import datetime, timezone
 
-from anthropic import AsyncAnthropic
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession
 from telegram import Bot
 
-from app.config import settings
 from app.models.job import Job
+from app.services.anthropic_client import get_anthropic_client
 from app.services.artifacts import save_artifact
 from app.services.interpreter.policy_engine import PolicyEngine
 from app.services.interpreter.prompts import assemble_prompt
@@ -36,7 +36,7 @@ from app.services.interpreter.structured_results import (
     validate_structured_results,
 )
 from app.services.job_queue import enqueue
-from app.services.outbox import enqueue_message, make_document_payload
+from app.services.outbox import enqueue_message, enqueue_messages, make_document_payload
 from app.webhooks.common import upsert_chat_state
 
 logger = logging.getLogger(__name__)
@@ -73,7 +73,7 @@ async def handle_interp_photo(
     image_media_type: str = p.get("image_media_type", "image/jpeg")
     state_payload = dict(p["state_payload"])
 
-    client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+    client = get_anthropic_client()
     resp = await client.messages.create(
         model=_ANTHROPIC_MODEL,
         max_tokens=2000,
@@ -95,7 +95,7 @@ async def handle_interp_photo(
     description = resp.content[0].text
 
     state_payload.setdefault("accumulated_material", []).append({
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "ts_ms": int(time.time() * 1000),
         "content": f"[Рисунок]\n\n{description}",
         "type": "image_analysis",
     })
@@ -149,7 +149,7 @@ async def handle_interp_intake(
     system_prompt = assemble_prompt("INTAKE", context)
     last_message = state_payload["accumulated_material"][-1]["content"]
 
-    client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+    client = get_anthropic_client()
     resp = await client.messages.create(
         model=_ANTHROPIC_MODEL,
         max_tokens=_MAX_TOKENS,
@@ -215,7 +215,7 @@ async def handle_interp_questions(
         m["content"] for m in state_payload.get("accumulated_material", [])
     )
 
-    client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+    client = get_anthropic_client()
     resp = await client.messages.create(
         model=_ANTHROPIC_MODEL,
         max_tokens=800,
@@ -322,7 +322,7 @@ async def handle_interp_run(
             "Создайте структурированную интерпретацию в формате JSON."
         )
 
-    client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+    client = get_anthropic_client()
     resp = await client.messages.create(
         model=_ANTHROPIC_MODEL,
         max_tokens=_MAX_TOKENS,
@@ -372,12 +372,14 @@ async def handle_interp_run(
 
     # Patch meta fields if Claude left them empty (session_id, timestamp, mode
     # are known to the worker but Claude may echo "string" or omit them).
+    # One clock read per run: meta timestamp and file name share it.
+    now = datetime.now(timezone.utc)
     output.setdefault("meta", {})
     _meta = output["meta"]
     if not _meta.get("session_id") or _meta.get("session_id") == "string":
         _meta["session_id"] = session_id
     if not _meta.get("timestamp"):
-        _meta["timestamp"] = datetime.now(timezone.utc).isoformat()
+        _meta["timestamp"] = now.isoformat()
     if not _meta.get("mode"):
         _meta["mode"] = run_mode
     if "iteration_count" not in _meta:
@@ -413,31 +415,28 @@ async def handle_interp_run(
         logger.warning("[worker/interp] structure validation warnings (proceeding): %s", errors)
 
     # Format and enqueue documents
-    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+    timestamp = now.strftime("%Y%m%d_%H%M%S")
     base_name = f"interpretation_{session_id}_{timestamp}"
 
     txt_bytes = format_to_txt(output).encode("utf-8")
-    json_bytes = json.dumps(output, indent=2, ensure_ascii=False).encode("utf-8")
-
-    await enqueue_message(
-        db, BOT_ID, job.chat_id, "send_message",
-        {"chat_id": job.chat_id, "text": "✅ Интерпретация завершена!"},
-        job_id=job.job_id, seq=0,
-    )
-    await enqueue_message(
-        db, BOT_ID, job.chat_id, "send_document",
-        make_document_payload(job.chat_id, txt_bytes, f"{base_name}.txt", "📄 Результаты интерпретации"),
-        job_id=job.job_id, seq=1,
-    )
-    await enqueue_message(
-        db, BOT_ID, job.chat_id, "send_document",
-        make_document_payload(job.chat_id, json_bytes, f"{base_name}.json", "📋 Структурированные данные (JSON)"),
-        job_id=job.job_id, seq=2,
-    )
-    await enqueue_message(
-        db, BOT_ID, job.chat_id, "send_message",
-        {"chat_id": job.chat_id, "text": "Сессия завершена. Запустите новую через бот Pro."},
-        job_id=job.job_id, seq=3,
+    json_bytes = orjson.dumps(output, option=orjson.OPT_INDENT_2)
+
+    await enqueue_messages(
+        db, BOT_ID, job.chat_id,
+        [
+            ("send_message", {"chat_id": job.chat_id, "text": "✅ Интерпретация завершена!"}),
+            ("send_document", make_document_payload(
+                job.chat_id, txt_bytes, f"{base_name}.txt", "📄 Результаты интерпретации",
+            )),
+            ("send_document", make_document_payload(
+                job.chat_id, json_bytes, f"{base_name}.json", "📋 Структурированные данные (JSON)",
+            )),
+            ("send_message", {
+                "chat_id": job.chat_id,
+                "text": "Сессия завершена. Запустите новую через бот Pro.",
+            }),
+        ],
+        job_id=job.job_id,
     )
 
     # Update FSM state
@@ -490,7 +489,7 @@ def _extract_message(response_text: str) -> str:
         else:
             return response_text
 
-        data = json.loads(json_str)
+        data = orjson.loads(json_str)
         for key in ("clarifying_question", "message", "question"):
             if data.get(key):
                 return str(data[key])
@@ -515,7 +514,7 @@ def _extract_questions(response_text: str) -> list[str]:
             json_str = response_text[response_text.find("{"):response_text.rfind("}") + 1]
         else:
             return []
-        data = json.loads(json_str)
+        data = orjson.loads(json_str)
         questions = data.get("questions", [])
         return [str(q).strip() for q in questions if q][:4]
     except Exception:
@@ -534,14 +533,14 @@ def _extract_json(response_text: str) -> dict | None:
             return None
 
         try:
-            return json.loads(json_str)
-        except json.JSONDecodeError:
+            return orjson.loads(json_str)
+        except orjson.JSONDecodeError:
             diff = json_str.count("{") - json_str.count("}")
             if diff > 0:
                 json_str += "}" * diff
             last_comma = json_str.rfind(",")
             if last_comma > 0:
                 json_str = json_str[:last_comma] + "\n}"
-            return json.loads(json_str)
+            return orjson.loads(json_str)
     except Exception:
         return None
@@ -5,12 +5,11 @@ job_type: "pro_reference"
 """
 import logging
 
-from anthropic import AsyncAnthropic
 from sqlalchemy.ext.asyncio import AsyncSession
 from telegram import Bot
 
-from app.config import settings
 from app.models.job import Job
+from app.services.anthropic_client import get_anthropic_client
 from app.services.outbox import enqueue_message, make_inline_keyboard
 from app.services.pro.reference_prompt import REFERENCE_SYSTEM_PROMPT
 from app.webhooks.common import upsert_chat_state
@@ -37,7 +36,7 @@ async def handle_pro_reference(
     """
     history = list(job.payload["history"])
 
-    client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+    client = get_anthropic_client()
     response = await client.messages.create(
         model=_REFERENCE_MODEL,
         max_tokens=_REFERENCE_MAX_TOKENS,
@@ -118,6 +118,13 @@ async def _save_artifact(
         logger.warning("[worker/screen] failed to save artifact for %s", assessment_id, exc_info=True)
 
 
+_NOTIFY_TEMPLATE = (
+    "✅ *Скрининг завершён*\n\n"
+    "Кейс: {label}\n\n"
+    "Для просмотра результатов откройте кейс в меню."
+)
+
+
 async def _notify_specialist(
     db: AsyncSession,
     assessment_id: UUID,
@@ -158,11 +165,7 @@ async def _notify_specialist(
 
         await pro_bot.send_message(
             chat_id=specialist_telegram_id,
-            text=(
-                f"✅ *Скрининг завершён*\n\n"
-                f"Кейс: {label}\n\n"
-                f"Для просмотра результатов откройте кейс в меню."
-            ),
+            text=_NOTIFY_TEMPLATE.format(label=label),
             parse_mode="Markdown",
         )
     except Exception:
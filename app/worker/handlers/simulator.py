@@ -27,17 +27,17 @@ job.payload keys for sim_report:
   state_payload dict  — full current state_payload (for profile)
   role          str
 """
+import asyncio
 import logging
 import re
 from datetime import datetime, timezone
 from typing import Optional
 
-from anthropic import AsyncAnthropic
 from sqlalchemy.ext.asyncio import AsyncSession
 from telegram import Bot
 
-from app.config import settings
 from app.models.job import Job
+from app.services.anthropic_client import get_anthropic_client
 from app.services.artifacts import save_artifact
 from app.services.outbox import enqueue_message, make_document_payload
 from app.services.simulator.cases import BUILTIN_CASES
@@ -51,10 +51,12 @@ from app.services.simulator.formatter import (
 from app.services.simulator.goals import GOAL_LABELS, MODE_LABELS
 from app.services.simulator.report_generator import generate_report_docx
 from app.services.simulator.schemas import (
-    CrisisFlag, SessionData, SessionGoal, SessionMode,
-    SpecialistProfile, TSIComponents, CCIComponents,
+    BuiltinCase, CaseDynamics, CCIComponents, ClientInfo, Conceptualization,
+    ContinuumScore, CrisisFlag, LayerA, LayerB, LayerC, LayerDescription,
+    Layers, ScreenProfile, SessionData, SessionGoal, SessionMode,
+    SpecialistProfile, Target, TSIComponents,
 )
-from app.services.simulator.system_prompt import build_system_prompt
+from app.services.simulator.system_prompt import build_system_prompt, builtin_case_prompt
 from app.webhooks.common import upsert_chat_state
 
 logger = logging.getLogger(__name__)
@@ -98,7 +100,7 @@ async def handle_sim_turn(
             + session_data.messages[-(_MAX_SESSION_HISTORY - 1):]
         )
 
-    client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+    client = get_anthropic_client()
     try:
         resp = await client.messages.create(
             model=_ANTHROPIC_MODEL,
@@ -178,7 +180,7 @@ async def handle_sim_launch(
     goal = SessionGoal(p["goal"])
     mode = SessionMode(p["mode"])
 
-    system_prompt = build_system_prompt(case, goal, mode)
+    system_prompt = builtin_case_prompt(case.case_id, goal, mode)
     session_data = SessionData(
         user_id=job.user_id or 0,
         case_id=case.case_id,
@@ -194,7 +196,7 @@ async def handle_sim_launch(
     )
     session_data.messages.append({"role": "user", "content": first_msg})
 
-    client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+    client = get_anthropic_client()
     resp = await client.messages.create(
         model=_ANTHROPIC_MODEL,
         max_tokens=2048,
@@ -285,7 +287,7 @@ async def handle_sim_launch_custom(
     )
     session_data.messages.append({"role": "user", "content": first_msg})
 
-    client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+    client = get_anthropic_client()
     resp = await client.messages.create(
         model=_ANTHROPIC_MODEL,
         max_tokens=2048,
@@ -350,7 +352,7 @@ async def handle_sim_report(
 
     end_messages = list(session_data.messages) + [{"role": "user", "content": "/end"}]
 
-    client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+    client = get_anthropic_client()
     resp = await client.messages.create(
         model=_ANTHROPIC_MODEL,
         max_tokens=8192,
@@ -382,7 +384,8 @@ async def handle_sim_report(
     context_short = str(job.context_id)[:8] if job.context_id else session_data.case_id
     filename = f"sim_report_{context_short}_{date_str.replace('-', '')}.docx"
     try:
-        docx_buf = generate_report_docx(
+        docx_buf = await asyncio.to_thread(
+            generate_report_docx,
             report_text=report_text,
             case_name=session_data.case_name,
             case_id=session_data.case_id,
@@ -444,10 +447,7 @@ def _get_system_prompt(payload: dict, session_data: SessionData) -> str:
     custom = payload.get("custom_prompt")
     if custom:
         return custom
-    case_map = {v.case_id: k for k, v in BUILTIN_CASES.items()}
-    case_key = case_map.get(session_data.case_id, "1")
-    case = BUILTIN_CASES.get(case_key, list(BUILTIN_CASES.values())[0])
-    return build_system_prompt(case, session_data.session_goal, session_data.mode)
+    return builtin_case_prompt(session_data.case_id, session_data.session_goal, session_data.mode)
 
 
 def _parse_tsi_from_report(report_text: str) -> Optional[TSIComponents]:
@@ -549,11 +549,6 @@ def _split_text(text: str, max_len: int = 4000) -> list[str]:
 
 def _build_placeholder_case(crisis: CrisisFlag):
     """Build a minimal placeholder BuiltinCase for the PRACTICE mode system prompt."""
-    from app.services.simulator.schemas import (
-        BuiltinCase, ScreenProfile, ContinuumScore, CaseDynamics,
-        Conceptualization, LayerA, LayerB, LayerC, LayerDescription,
-        Layers, Target, ClientInfo,
-    )
     return BuiltinCase(
         case_id="CUSTOM",
         case_name="Пользовательский кейс",
@@ -14,6 +14,14 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from telegram import Bot
 from app.config import settings
 
+# Only the update types the handlers act on. No handler reads edited_message,
+# so subscribing to it just cost a dedup insert + FSM row lock per edit. Pro
+# needs pre_checkout_query to confirm Stars invoices.
+_ALLOWED_UPDATES = ["message", "callback_query"]
+_ALLOWED_UPDATES_BY_BOT = {
+    "pro": [*_ALLOWED_UPDATES, "pre_checkout_query"],
+}
+
 
 async def set_webhooks():
     base_url = settings.WEBHOOK_BASE_URL
@@ -32,7 +40,7 @@ async def set_webhooks():
                 url=webhook_url,
                 secret_token=secret,
                 drop_pending_updates=True,
-                allowed_updates=["message", "callback_query", "edited_message"],
+                allowed_updates=_ALLOWED_UPDATES_BY_BOT.get(bot_id, _ALLOWED_UPDATES),
             )
             info = await bot.get_webhook_info()
             print(f"  [{bot_id}] URL: {webhook_url}")
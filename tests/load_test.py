@@ -12,8 +12,8 @@ Architecture
 * All service calls are replaced in-process (no HTTP, no real DB):
     - verify_link, upsert_chat_state, enqueue, is_job_pending_for_chat
       → SharedState (asyncio.Lock-protected in-memory store)
-    - save_artifact, enqueue_message → SharedState
-    - AsyncAnthropic.messages.create → smart mock (inspects max_tokens)
+    - save_artifact, enqueue_message(s) → SharedState
+    - get_anthropic_client().messages.create → smart mock (inspects max_tokens)
 * Worker jobs are processed inline per user immediately after they are
   enqueued (no real worker loop — exercises handler logic directly).
 * 30 coroutines run concurrently via asyncio.gather.
@@ -287,6 +287,18 @@ class SharedState:
         async with self._lock:
             self.outbox.append({"chat_id": chat_id, "type": msg_type})
 
+    async def fake_enqueue_messages(
+        self,
+        db: Any,
+        bot_id: str,
+        chat_id: int,
+        items: list[tuple[str, dict]],
+        *,
+        job_id: Any = None,
+    ) -> None:
+        async with self._lock:
+            self.outbox.extend({"chat_id": chat_id, "type": t} for t, _ in items)
+
     async def fake_is_job_pending(
         self, db: Any, bot_id: str, chat_id: int
     ) -> bool:
@@ -501,10 +513,11 @@ async def test_30_concurrent_interpreter_sessions() -> None:
         patch("app.worker.handlers.interpretator.upsert_chat_state", new=shared.fake_upsert),
         patch("app.worker.handlers.interpretator.enqueue",            new=shared.fake_enqueue),
         patch("app.worker.handlers.interpretator.enqueue_message",    new=shared.fake_enqueue_message),
+        patch("app.worker.handlers.interpretator.enqueue_messages",   new=shared.fake_enqueue_messages),
         patch("app.worker.handlers.interpretator.save_artifact",      new=shared.fake_save_artifact),
         patch(
-            "app.worker.handlers.interpretator.AsyncAnthropic",
-            new=lambda *a, **kw: _make_claude_client(),
+            "app.worker.handlers.interpretator.get_anthropic_client",
+            new=lambda: _make_claude_client(),
         ),
     ]
 
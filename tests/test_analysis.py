@@ -0,0 +1,122 @@
+"""Tests for the Claude circuit breaker in conceptualizer hypothesis extraction."""
+from unittest.mock import AsyncMock, MagicMock
+
+import anthropic
+import httpx
+import pytest
+
+from app.services.conceptualizer import analysis
+from app.services.conceptualizer.enums import ConfidenceLevel, HypothesisType
+from app.services.conceptualizer.models import SessionState
+
+_GOOD_REPLY = (
+    '{"type": "managerial", "levels": ["L0"], "formulation": "Начать со сна.",'
+    ' "confidence": "working", "reasoning": "точка влияния"}'
+)
+
+
+def _api_error() -> anthropic.APIError:
+    return anthropic.APIConnectionError(
+        request=httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    )
+
+
+def _reply(text: str) -> MagicMock:
+    resp = MagicMock()
+    resp.content = [MagicMock(text=text)]
+    return resp
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Fresh breaker state and a mocked Claude client."""
+    monkeypatch.setattr(analysis, "_consecutive_failures", 0)
+    monkeypatch.setattr(analysis, "_cooldown_until", 0.0)
+    mock = MagicMock()
+    mock.messages.create = AsyncMock()
+    monkeypatch.setattr(analysis, "get_anthropic_client", lambda: mock)
+    return mock
+
+
+def _session() -> SessionState:
+    return SessionState(session_id="s", specialist_id="u")
+
+
+def _is_fallback(hyp) -> bool:
+    return hyp.foundations == ["Fallback extraction"]
+
+
+class TestCircuitBreaker:
+    async def test_opens_after_threshold_api_errors(self, client):
+        client.messages.create.side_effect = _api_error()
+        for _ in range(analysis._BREAKER_THRESHOLD):
+            hyp = await analysis.extract_hypothesis_from_response("текст", _session())
+            assert _is_fallback(hyp)
+
+        assert client.messages.create.await_count == analysis._BREAKER_THRESHOLD
+        assert analysis._cooldown_until > 0.0
+
+    async def test_short_circuits_during_cooldown(self, client):
+        client.messages.create.side_effect = _api_error()
+        for _ in range(analysis._BREAKER_THRESHOLD):
+            await analysis.extract_hypothesis_from_response("текст", _session())
+        client.messages.create.reset_mock()
+
+        hyp = await analysis.extract_hypothesis_from_response("сообщение", _session())
+
+        client.messages.create.assert_not_awaited()
+        assert _is_fallback(hyp)
+        assert hyp.type == HypothesisType.STRUCTURAL
+        assert hyp.formulation == "сообщение"
+
+    async def test_success_resets_failure_count(self, client):
+        client.messages.create.side_effect = (
+            [_api_error()] * (analysis._BREAKER_THRESHOLD - 1)
+            + [_reply(_GOOD_REPLY)]
+            + [_api_error()]
+        )
+        for _ in range(analysis._BREAKER_THRESHOLD - 1):
+            await analysis.extract_hypothesis_from_response("текст", _session())
+
+        hyp = await analysis.extract_hypothesis_from_response("текст", _session())
+        assert hyp.type == HypothesisType.MANAGERIAL
+        assert hyp.confidence == ConfidenceLevel.WORKING
+        assert analysis._consecutive_failures == 0
+
+        # One more error after the reset must not trip the breaker.
+        await analysis.extract_hypothesis_from_response("текст", _session())
+        assert analysis._consecutive_failures == 1
+        assert analysis._cooldown_until == 0.0
+
+    async def test_parse_failures_do_not_count(self, client):
+        client.messages.create.return_value = _reply("не JSON")
+        for _ in range(analysis._BREAKER_THRESHOLD + 1):
+            hyp = await analysis.extract_hypothesis_from_response("текст", _session())
+            assert _is_fallback(hyp)
+
+        assert analysis._consecutive_failures == 0
+        assert analysis._cooldown_until == 0.0
+        assert client.messages.create.await_count == analysis._BREAKER_THRESHOLD + 1
+
+    async def test_client_errors_do_not_count(self, client):
+        request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+        client.messages.create.side_effect = anthropic.BadRequestError(
+            "bad request", response=httpx.Response(400, request=request), body=None,
+        )
+        for _ in range(analysis._BREAKER_THRESHOLD + 1):
+            hyp = await analysis.extract_hypothesis_from_response("текст", _session())
+            assert _is_fallback(hyp)
+
+        assert analysis._consecutive_failures == 0
+        assert analysis._cooldown_until == 0.0
+
+    async def test_failure_count_restarts_after_cooldown(self, client, monkeypatch):
+        monkeypatch.setattr(analysis, "_consecutive_failures", analysis._BREAKER_THRESHOLD)
+        monkeypatch.setattr(analysis, "_cooldown_until", 1.0)  # long expired
+        client.messages.create.side_effect = _api_error()
+
+        await analysis.extract_hypothesis_from_response("текст", _session())
+
+        client.messages.create.assert_awaited_once()
+        assert analysis._consecutive_failures == 1
+        assert analysis._cooldown_until == 0.0
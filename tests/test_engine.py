@@ -284,6 +284,15 @@ class TestProcessResponse:
         ScreeningEngine.process_response(state, TEST_RESPONSES[1])
         assert len(state["response_history"]) == original_len
 
+    def test_batch_matches_sequential(self):
+        sequential: dict = {}
+        for r in TEST_RESPONSES:
+            sequential = ScreeningEngine.process_response(sequential, r)
+        batched = ScreeningEngine.process_responses(
+            {"response_history": TEST_RESPONSES[:4]}, TEST_RESPONSES[4:]
+        )
+        assert batched == sequential
+
     def test_full_pipeline_14_responses(self):
         """Process all 14 responses sequentially; final state must satisfy axis/layer invariants."""
         state: dict = {}
@@ -0,0 +1,45 @@
+"""Tests for Claude JSON reply parsing (app.utils.json_fence)."""
+import pytest
+
+from app.utils.json_fence import loads_json_response, strip_code_fence
+
+
+class TestStripCodeFence:
+    def test_json_fence(self):
+        assert strip_code_fence('```json\n{"a": 1}\n```') == '{"a": 1}'
+
+    def test_plain_fence(self):
+        assert strip_code_fence('```\n{"a": 1}\n```') == '{"a": 1}'
+
+    def test_unclosed_fence(self):
+        assert strip_code_fence('```json\n{"a": 1}') == '{"a": 1}'
+
+    def test_no_fence(self):
+        assert strip_code_fence('  {"a": 1}\n') == '{"a": 1}'
+
+
+class TestLoadsJsonResponse:
+    def test_fenced(self):
+        text = '```json\n{"type": "managerial", "levels": ["L0"]}\n```'
+        assert loads_json_response(text) == {"type": "managerial", "levels": ["L0"]}
+
+    def test_bare(self):
+        assert loads_json_response('{"a": 1, "b": "текст"}') == {"a": 1, "b": "текст"}
+
+    def test_prose_wrapped(self):
+        text = 'Вот результат:\n{"a": {"b": [1, 2]}}\nНадеюсь, это поможет.'
+        assert loads_json_response(text) == {"a": {"b": [1, 2]}}
+
+    def test_trailing_junk(self):
+        assert loads_json_response('{"a": 1} }} лишнее') == {"a": 1}
+
+    def test_fenced_with_trailing_junk(self):
+        assert loads_json_response('```json\n{"a": 1}\n// note\n```') == {"a": 1}
+
+    def test_no_object_raises(self):
+        with pytest.raises(ValueError):
+            loads_json_response("Извините, не могу ответить.")
+
+    def test_broken_object_raises(self):
+        with pytest.raises(ValueError):
+            loads_json_response('Ответ: {"a": 1,')
@@ -29,7 +29,12 @@ import pytest
 
 # ── App imports (env vars are already set by conftest.py) ──────────────────────
 from app.webhooks.pro import create_case, handle_invite_start
-from app.webhooks.screen import _handle_start_token
+from app.services.screen import screen_bank
+from app.webhooks.screen import (
+    _cb_confirm_selection,
+    _handle_start_token,
+    _multi_select_markup,
+)
 from app.webhooks.interpretator import _start_session as interp_start
 from app.webhooks.conceptualizator import (
     _handle_data_collection,
@@ -247,6 +252,92 @@ async def test_screen_start_token() -> None:
     )
 
 
+async def test_screen_confirm_selection_completes_assessment() -> None:
+    """Last answer → FSM 'completed' and a screen_report job is enqueued."""
+    assessment_id = uuid.uuid4()
+    state = _mk_state("phase3", bot_id="screen", payload={
+        "assessment_id": str(assessment_id),
+        "run_id": str(uuid.uuid4()),
+        "phase": 3,
+        "current_screen": {"question": "?", "options": [{"text": "a"}]},
+        "selected_options": [0],
+    })
+    bot = AsyncMock()
+    query = AsyncMock()
+    orchestrator = MagicMock()
+    orchestrator.process_phase3_response = AsyncMock(return_value={"action": "complete"})
+    upsert = AsyncMock(return_value=state)
+    enqueue = AsyncMock()
+
+    with (
+        patch("app.webhooks.screen.ScreenOrchestrator", return_value=orchestrator),
+        patch("app.webhooks.screen.upsert_chat_state", upsert),
+        patch("app.webhooks.screen.is_job_pending_for_chat", AsyncMock(return_value=False)),
+        patch("app.webhooks.screen.enqueue", enqueue),
+    ):
+        await _cb_confirm_selection(query, bot, AsyncMock(), state, CHAT_ID, USER_ID, "")
+
+    orchestrator.process_phase3_response.assert_awaited_once()
+    upsert.assert_awaited_once()
+    assert upsert.call_args.args[3] == "completed", (
+        f"Expected FSM 'completed'; got: {upsert.call_args.args[3]!r}"
+    )
+    assert "selected_options" not in upsert.call_args.kwargs["state_payload"]
+    enqueue.assert_awaited_once()
+    assert enqueue.call_args.args[1] == "screen_report"
+    assert enqueue.call_args.kwargs["payload"]["assessment_id"] == str(assessment_id)
+
+
+async def test_screen_phase2_completion_drops_screen_reference() -> None:
+    """Completing from Phase 2 clears the bank-screen reference from the payload."""
+    node = screen_bank.get_all_phase2_nodes()[0]
+    state = _mk_state("phase2", bot_id="screen", payload={
+        "assessment_id": str(uuid.uuid4()),
+        "run_id": str(uuid.uuid4()),
+        "phase": 2,
+        "screen_index": 0,
+        "current_node": node,
+        "selected_options": [0],
+    })
+    orchestrator = MagicMock()
+    orchestrator.process_phase2_response = AsyncMock(return_value={"action": "complete"})
+    upsert = AsyncMock(return_value=state)
+
+    with (
+        patch("app.webhooks.screen.ScreenOrchestrator", return_value=orchestrator),
+        patch("app.webhooks.screen.upsert_chat_state", upsert),
+        patch("app.webhooks.screen.is_job_pending_for_chat", AsyncMock(return_value=False)),
+        patch("app.webhooks.screen.enqueue", AsyncMock()),
+    ):
+        await _cb_confirm_selection(AsyncMock(), AsyncMock(), AsyncMock(), state, CHAT_ID, USER_ID, "")
+
+    # The Phase 2 screen was resolved from the node reference
+    screen = orchestrator.process_phase2_response.call_args.args[2]
+    assert screen["node"] == node
+
+    assert upsert.call_args.args[3] == "completed"
+    saved = upsert.call_args.kwargs["state_payload"]
+    assert "current_node" not in saved
+    assert "current_screen" not in saved
+    assert "selected_options" not in saved
+
+
+def test_screen_multi_select_markup_rows() -> None:
+    """Selected options render checked, others unchecked, confirm row last."""
+    options = [{"text": "один"}, {"text": "два"}, {"text": "три"}]
+    rows = _multi_select_markup(options, [1]).inline_keyboard
+
+    assert [row[0].text for row in rows] == [
+        "⬜ один", "✅ два", "⬜ три", "Подтвердить ✓",
+    ]
+    assert [row[0].callback_data for row in rows] == [
+        "toggle_0", "toggle_1", "toggle_2", "confirm_selection",
+    ]
+
+    again = _multi_select_markup(options, [0, 1]).inline_keyboard
+    assert [row[0].text for row in again[:3]] == ["✅ один", "✅ два", "⬜ три"]
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # Test 3 — Interpreter bot: /start {jti} → session opened, welcome sent
 # ══════════════════════════════════════════════════════════════════════════════